@@ -1,24 +1,28 @@
 """Configuration settings for the phonetics annotation pipeline."""
 
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List
 
-from pydantic import Field, validator
-from pydantic_settings import BaseSettings
+from pydantic import Field, field_validator, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class DataSettings(BaseSettings):
     """Data-related configuration."""
     
+    model_config = SettingsConfigDict(frozen=True)
+    
     data_root: Path = Field(default=Path("./data"), description="Root data directory")
     raw_data_path: Path = Field(default=Path("./data/raw"), description="Raw data directory")
     processed_data_path: Path = Field(default=Path("./data/processed"), description="Processed data directory")
     output_data_path: Path = Field(default=Path("./data/outputs"), description="Output data directory")
     
-    @validator("data_root", "raw_data_path", "processed_data_path", "output_data_path")
+    @field_validator("data_root", "raw_data_path", "processed_data_path", "output_data_path", mode="before")
+    @classmethod
     def resolve_paths(cls, v):
         """Resolve relative paths to absolute paths."""
-        return v.resolve()
+        return Path(v).resolve()
 
 
 class LoggingSettings(BaseSettings):
@@ -27,7 +31,8 @@ class LoggingSettings(BaseSettings):
     log_level: str = Field(default="INFO", description="Logging level")
     log_format: str = Field(default="json", description="Log format (json or text)")
     
-    @validator("log_level")
+    @field_validator("log_level", mode="before")
+    @classmethod
     def validate_log_level(cls, v):
         """Validate log level."""
         valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
@@ -43,12 +48,12 @@ class PatternSettings(BaseSettings):
     max_pattern_length: int = Field(default=50, ge=1, description="Maximum pattern length")
     enable_stopword_filter: bool = Field(default=True, description="Enable stopword filtering")
     
-    @validator("max_pattern_length")
-    def validate_max_length(cls, v, values):
+    @model_validator(mode="after")
+    def validate_max_length(self) -> "PatternSettings":
         """Validate max length is greater than min length."""
-        if "min_pattern_length" in values and v <= values["min_pattern_length"]:
+        if self.max_pattern_length <= self.min_pattern_length:
             raise ValueError("max_pattern_length must be greater than min_pattern_length")
-        return v
+        return self
 
 
 class SamplingSettings(BaseSettings):
@@ -86,20 +91,15 @@ class Settings(BaseSettings):
     prodigy: ProdigySettings = Field(default_factory=ProdigySettings)
     processing: ProcessingSettings = Field(default_factory=ProcessingSettings)
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        env_nested_delimiter = "__"
-        case_sensitive = False
-
-
-# Global settings instance
-_settings: Optional[Settings] = None
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        env_nested_delimiter="__",
+        case_sensitive=False,
+    )
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get the global settings instance."""
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    """Get the global settings instance (constructed and validated once)."""
+    return Settings()
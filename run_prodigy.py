@@ -3,11 +3,13 @@
 
 import argparse
 import os
-import subprocess
 import sys
 import yaml
 from pathlib import Path
 
+# libyaml-backed loader when available, much faster
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def load_config(config_file="prodigy_config.yaml"):
     """Load configuration from YAML file."""
     if not Path(config_file).exists():
@@ -15,7 +17,7 @@ def load_config(config_file="prodigy_config.yaml"):
         sys.exit(1)
 
     with open(config_file, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
 
     return config['prodigy']
 
@@ -89,15 +91,19 @@ def run_prodigy(config, mode="local"):
     print("Press Ctrl+C to stop")
     print("-" * 50)
 
-    # Run Prodigy
+    # Replace this process with Prodigy: no idle supervisor interpreter, and
+    # signals such as Ctrl+C go straight to Prodigy. exec only returns on error.
+    sys.stdout.flush()
     try:
-        subprocess.run(cmd, env=env, check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Prodigy failed with exit code {e.returncode}")
-        sys.exit(e.returncode)
-    except KeyboardInterrupt:
-        print("\n🛑 Prodigy stopped by user")
-        sys.exit(0)
+        os.execvpe(cmd[0], cmd, env)
+    except FileNotFoundError:
+        print("Error: 'prodigy' executable not found. Is Prodigy installed?")
+        sys.exit(127)
+    except OSError as e:
+        # Found but could not be run (not executable, bad format, ...);
+        # 126 as the shell reports it
+        print(f"Error: could not run '{cmd[0]}': {e}")
+        sys.exit(126)
 
 def main():
     """Main entry point."""
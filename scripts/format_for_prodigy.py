@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Convert Gemini dialogue outputs to Prodigy JSONL, one output file per input file."""
+
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Tuple
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import get_settings
+from src.prodigy.formatter import ProdigyFormatter
+from src.utils.jsonl import list_jsonl_files
+from src.utils.logging import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+
+def convert_file(paths: Tuple[Path, Path]) -> int:
+    """Convert a single (input, output) file pair and return the record count."""
+    input_file, output_file = paths
+    return ProdigyFormatter().format_gemini_file(input_file, output_file)
+
+
+def main() -> int:
+    """Main entry point for Prodigy formatting."""
+    parser = argparse.ArgumentParser(
+        description="Convert Gemini dialogue outputs to Prodigy JSONL"
+    )
+    parser.add_argument(
+        "input_dir",
+        type=Path,
+        help="Directory containing Gemini data files (JSONL format)"
+    )
+    parser.add_argument(
+        "-o", "--output-dir",
+        type=Path,
+        required=True,
+        help="Directory for the converted Prodigy files"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Number of worker processes (default: from settings)"
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="Logging level"
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=["json", "text"],
+        default="text",
+        help="Log format"
+    )
+
+    args = parser.parse_args()
+
+    # Setup logging
+    setup_logging(
+        log_level=args.log_level,
+        log_format=args.log_format
+    )
+
+    try:
+        # Validate input directory
+        if not args.input_dir.is_dir():
+            logger.error(f"Input directory not found: {args.input_dir}")
+            return 1
+
+        # Writing into the input directory would replace the inputs
+        if args.output_dir.resolve() == args.input_dir.resolve():
+            logger.error(f"Output directory must differ from the input directory: {args.output_dir}")
+            return 1
+
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+
+        max_workers = args.max_workers
+        if max_workers is None:
+            max_workers = get_settings().processing.max_workers
+
+        input_files = list_jsonl_files(args.input_dir)
+        pairs = [(input_file, args.output_dir / input_file.name) for input_file in input_files]
+        logger.info(f"Converting {len(pairs)} files with {max_workers} workers")
+
+        # Files are independent, so convert them in parallel processes
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            counts = list(executor.map(convert_file, pairs))
+
+        logger.info(f"Successfully converted {sum(counts)} items from {len(pairs)} files")
+        logger.info(f"Prodigy data saved to: {args.output_dir}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"Prodigy formatting failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    exit(main())
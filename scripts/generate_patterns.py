@@ -4,13 +4,11 @@
 import argparse
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.patterns.generator import PatternGenerator
-from src.patterns.filters import PatternFilter
 from src.utils.logging import get_logger, setup_logging
 
 logger = get_logger(__name__)
@@ -22,9 +20,11 @@ def main():
         description="Generate patterns from phonetic data for Prodigy annotation"
     )
     parser.add_argument(
-        "input_file",
+        "input_files",
         type=Path,
-        help="Input GB data file (JSONL format)"
+        nargs="+",
+        metavar="input_file",
+        help="Input GB data file(s) (JSONL format)"
     )
     parser.add_argument(
         "-o", "--output",
@@ -48,6 +48,11 @@ def main():
         action="store_true",
         help="Disable stopword filtering"
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Worker processes when given several input files (default: from settings)"
+    )
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
@@ -69,22 +74,30 @@ def main():
         log_format=args.log_format
     )
     
+    # Import the pattern modules (and spaCy with them) only once arguments
+    # are parsed, so --help and argument errors return immediately
+    from src.patterns.filters import PatternFilter
+    from src.patterns.generator import Pattern, PatternGenerator
+    
     # Determine output file
     output_file = args.output or Path("patterns.jsonl")
     
     try:
-        # Validate input file
-        if not args.input_file.exists():
-            logger.error(f"Input file not found: {args.input_file}")
-            return 1
+        # Validate input files
+        for input_file in args.input_files:
+            if not input_file.exists():
+                logger.error(f"Input file not found: {input_file}")
+                return 1
         
-        logger.info(f"Starting pattern generation from {args.input_file}")
+        logger.info(f"Starting pattern generation from {len(args.input_files)} file(s)")
         logger.info(f"Min length: {args.min_length}, Max length: {args.max_length}")
         logger.info(f"Stopword filter: {not args.no_stopword_filter}")
         
-        # Generate patterns
+        # Generate patterns lazily (files are sharded across processes when
+        # there are several); the filters below consume the stream directly
+        # instead of a fully materialized intermediate list
         generator = PatternGenerator()
-        patterns = generator.generate_from_gb_data(args.input_file)
+        patterns: Iterable[Pattern] = generator.generate_from_gb_files(args.input_files, max_workers=args.max_workers)
         
         # Apply additional filtering if needed
         if args.min_length != 3 or args.max_length != 50:
@@ -98,9 +111,9 @@ def main():
         patterns = filter_obj.deduplicate_patterns(patterns)
         
         # Save patterns
-        generator.save_patterns(patterns, output_file)
+        saved_count = generator.save_patterns(patterns, output_file)
         
-        logger.info(f"Successfully generated {len(patterns)} patterns")
+        logger.info(f"Successfully generated {saved_count} patterns")
         logger.info(f"Patterns saved to: {output_file}")
         return 0
         
@@ -10,7 +10,7 @@ from typing import List
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.sampling import DataBalancer
+from src.utils.jsonl import list_jsonl_files
 from src.utils.logging import get_logger, setup_logging
 
 logger = get_logger(__name__)
@@ -82,6 +82,10 @@ def main():
         log_format=args.log_format
     )
     
+    # Import the sampling modules only once arguments are parsed, so --help
+    # and argument errors return immediately
+    from src.sampling import DataBalancer
+    
     try:
         # Validate arguments
         if not args.gb_file and not args.gemini_files and not args.gemini_dir:
@@ -93,12 +97,13 @@ def main():
             return 1
         
         if args.gemini_files:
-            for gemini_file in args.gemini_files:
-                if not gemini_file.exists():
+            missing = [path for path in args.gemini_files if not path.is_file()]
+            if missing:
+                for gemini_file in missing:
                     logger.error(f"Gemini file not found: {gemini_file}")
-                    return 1
+                return 1
         
-        if args.gemini_dir and not args.gemini_dir.exists():
+        if args.gemini_dir and not args.gemini_dir.is_dir():
             logger.error(f"Gemini directory not found: {args.gemini_dir}")
             return 1
         
@@ -115,22 +120,28 @@ def main():
         # Get Gemini files from directory if specified
         gemini_files = args.gemini_files
         if args.gemini_dir:
-            gemini_files = list(args.gemini_dir.glob("*.jsonl"))
+            # Sorted, so a given --random-seed samples the same way on any
+            # filesystem
+            gemini_files = list_jsonl_files(args.gemini_dir)
             logger.info(f"Found {len(gemini_files)} Gemini files in {args.gemini_dir}")
         
+        # Generate timestamped output filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = args.output.parent / f"{args.output.stem}_{timestamp}{args.output.suffix}"
+        
         # Sample data based on available sources
         if args.gb_file and gemini_files:
-            # Mixed data sources
+            # Mixed data sources; the rows are formatted lazily as they are
+            # written, and the statistics come with them
             logger.info("Using mixed data sources (GB + Gemini)")
-            gb_data, gemini_data = balancer.balance_mixed_data(
+            mixed_rows, stats = balancer.balance_mixed_stream(
                 gb_file=args.gb_file,
                 gemini_files=gemini_files,
                 sample_size=args.sample_size,
                 dialogue_ratio=args.phonetized_ratio
             )
-            
-            # Combine data
-            balanced_data = gb_data + gemini_data
+            logger.info(f"Balance statistics: {stats}")
+            balancer.save_prodigy_rows(mixed_rows, output_path)
             
         elif args.gb_file:
             # GB data only
@@ -140,6 +151,9 @@ def main():
                 sample_size=args.sample_size,
                 dialogue_ratio=args.phonetized_ratio
             )
+            stats = balancer.get_balance_statistics(balanced_data)
+            logger.info(f"Balance statistics: {stats}")
+            balancer.save_balanced_data(balanced_data, output_path)
             
         else:
             # Gemini data only
@@ -149,17 +163,9 @@ def main():
                 sample_size=args.sample_size,
                 phonetized_ratio=args.phonetized_ratio
             )
-        
-        # Get balance statistics
-        stats = balancer.get_balance_statistics(balanced_data)
-        logger.info(f"Balance statistics: {stats}")
-
-        # Generate timestamped output filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = args.output.parent / f"{args.output.stem}_{timestamp}{args.output.suffix}"
-
-        # Save balanced data
-        balancer.save_balanced_data(balanced_data, output_path)
+            stats = balancer.get_balance_statistics(balanced_data)
+            logger.info(f"Balance statistics: {stats}")
+            balancer.save_balanced_data(balanced_data, output_path)
 
         # Save pattern usage statistics with sample counts
         pattern_stats_path = output_path.parent / f"{output_path.stem}_pattern_usage.txt"
@@ -169,7 +175,7 @@ def main():
             non_phonetized_count=stats['non_phonetized']
         )
         
-        logger.info(f"Successfully sampled {len(balanced_data)} items")
+        logger.info(f"Successfully sampled {stats['total']} items")
         logger.info(f"Sampled data saved to: {output_path}")
         logger.info(f"Pattern usage statistics saved to: {pattern_stats_path}")
         
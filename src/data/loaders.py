@@ -1,17 +1,31 @@
 """Data loading utilities."""
 
-import json
+import logging
+import re
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import jsonlines
 from pydantic import BaseModel, Field
 
+from ..utils.jsonl import iter_lines, loads
 from ..utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Keys that identify a file's format. A quote inside a JSON string value is
+# always escaped, so a quoted name right after ``{`` or ``,`` and followed by
+# ``:`` is an object key; it may still belong to a nested object, which the
+# exact key-set check in create_loader leaves to the parse fallback
+_FORMAT_KEY_RE = re.compile(rb'[{,]\s*"(sample_id|words|utterance)"\s*:')
+
+# Bytes of the first line inspected by create_loader
+_PROBE_SIZE = 8192
+
+# Key sets found by the probe that identify a format without parsing
+_GB_FORMAT_KEYS = frozenset({b'sample_id', b'words'})
+_GEMINI_FORMAT_KEYS = frozenset({b'utterance'})
+
 
 class GBDataItem(BaseModel):
     """GB data item model."""
@@ -54,6 +68,22 @@ class DataLoader(ABC):
     def load_all(self) -> List[Any]:
         """Load all data from file into memory."""
         return list(self.load())
+    
+    def _iter_jsonl(self) -> Iterator[Tuple[int, bytes]]:
+        """Yield (line number, raw line) for each non-blank line of the file."""
+        for line_num, line in enumerate(iter_lines(self.file_path), 1):
+            if not line.isspace():
+                yield line_num, line
+    
+    def _log_skipped_lines(self, skipped: int, first_error: Optional[Tuple[int, str]]) -> None:
+        """Emit a single warning summarizing the lines that failed to parse."""
+        # first_error is set exactly when a line was skipped
+        if first_error is not None:
+            line_num, error = first_error
+            self.logger.warning(
+                f"Skipped {skipped} malformed lines in {self.file_path}; "
+                f"first at line {line_num}: {error}"
+            )
 
 
 class GBDataLoader(DataLoader):
@@ -63,14 +93,27 @@ class GBDataLoader(DataLoader):
         """Load GB data items from JSONL file."""
         self.logger.info(f"Loading GB data from {self.file_path}")
         
+        # Validate the parsed dict directly; avoids **kwargs re-packing
+        validate = GBDataItem.model_validate
+        
+        # Bad lines are counted and reported once at the end; per-line
+        # detail only at DEBUG level
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        skipped = 0
+        first_error = None
+        
         try:
-            with jsonlines.open(self.file_path) as reader:
-                for line_num, line in enumerate(reader, 1):
-                    try:
-                        yield GBDataItem(**line)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to parse line {line_num}: {e}")
-                        continue
+            for line_num, line in self._iter_jsonl():
+                try:
+                    yield validate(loads(line))
+                except Exception as e:
+                    skipped += 1
+                    if first_error is None:
+                        first_error = (line_num, str(e))
+                    if debug:
+                        self.logger.debug(f"Failed to parse line {line_num}: {e}")
+                    continue
+            self._log_skipped_lines(skipped, first_error)
         except Exception as e:
             self.logger.error(f"Failed to load GB data: {e}")
             raise
@@ -83,16 +126,28 @@ class GeminiDataLoader(DataLoader):
         """Load Gemini data items from JSONL file."""
         self.logger.info(f"Loading Gemini data from {self.file_path}")
         
+        validate = GeminiDataItem.model_validate
+        source_file = self.file_path.name
+        
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        skipped = 0
+        first_error = None
+        
         try:
-            with jsonlines.open(self.file_path) as reader:
-                for line_num, line in enumerate(reader, 1):
-                    try:
-                        # Add source file name to the data
-                        line['source_file'] = self.file_path.name
-                        yield GeminiDataItem(**line)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to parse line {line_num}: {e}")
-                        continue
+            for line_num, line in self._iter_jsonl():
+                try:
+                    data = loads(line)
+                    # Add source file name to the data
+                    data['source_file'] = source_file
+                    yield validate(data)
+                except Exception as e:
+                    skipped += 1
+                    if first_error is None:
+                        first_error = (line_num, str(e))
+                    if debug:
+                        self.logger.debug(f"Failed to parse line {line_num}: {e}")
+                    continue
+            self._log_skipped_lines(skipped, first_error)
         except Exception as e:
             self.logger.error(f"Failed to load Gemini data: {e}")
             raise
@@ -100,16 +155,30 @@ class GeminiDataLoader(DataLoader):
 
 def create_loader(file_path: Path) -> DataLoader:
     """Create appropriate loader based on file content."""
-    # Simple heuristic: check if file contains GB data structure
+    # Simple heuristic: check the first record for the GB or Gemini keys.
+    # Fast path: look for the identifying keys in the raw first line
+    # instead of parsing it. It only decides when the whole line fit in
+    # the probe and the keys found point to exactly one format; anything
+    # else falls back to parsing the full first record.
     try:
-        with open(file_path, 'r') as f:
-            first_line = f.readline().strip()
-            if first_line:
-                data = json.loads(first_line)
-                if 'sample_id' in data and 'words' in data:
+        with open(file_path, 'rb') as f:
+            first_line = f.readline(_PROBE_SIZE)
+            complete = len(first_line) < _PROBE_SIZE or first_line.endswith(b'\n')
+            if complete:
+                keys = set(_FORMAT_KEY_RE.findall(first_line))
+                if keys == _GB_FORMAT_KEYS:
                     return GBDataLoader(file_path)
-                elif 'utterance' in data:
+                elif keys == _GEMINI_FORMAT_KEYS:
                     return GeminiDataLoader(file_path)
+            else:
+                first_line += f.readline()
+        
+        if first_line.strip():
+            data = loads(first_line)
+            if 'sample_id' in data and 'words' in data:
+                return GBDataLoader(file_path)
+            elif 'utterance' in data:
+                return GeminiDataLoader(file_path)
     except Exception:
         pass
     
@@ -8,6 +8,14 @@ from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Required keys, in the order they are reported when missing
+_GB_REQUIRED_FIELDS = ("sample_id", "g_id", "author", "title", "sample", "words")
+_GB_REQUIRED_WORD_FIELDS = ("Std", "Prov", "OCR", "i")
+
+# The same keys as sets, for a single C-level subset test per dict
+_GB_REQUIRED_FIELD_SET = frozenset(_GB_REQUIRED_FIELDS)
+_GB_REQUIRED_WORD_FIELD_SET = frozenset(_GB_REQUIRED_WORD_FIELDS)
+
 
 class ValidationError(Exception):
     """Custom exception for data validation errors."""
@@ -17,6 +25,8 @@ class ValidationError(Exception):
 class DataValidator:
     """Validate data integrity and format."""
     
+    __slots__ = ("logger",)
+    
     def __init__(self):
         """Initialize data validator."""
         self.logger = get_logger(self.__class__.__name__)
@@ -24,12 +34,12 @@ class DataValidator:
     def validate_gb_data_item(self, data: Dict[str, Any]) -> bool:
         """Validate a single GB data item."""
         try:
-            # Check required fields
-            required_fields = ["sample_id", "g_id", "author", "title", "sample", "words"]
-            for field in required_fields:
-                if field not in data:
-                    self.logger.warning(f"Missing required field: {field}")
-                    return False
+            # Check required fields; the field name is only looked up on
+            # the failure path
+            if not data.keys() >= _GB_REQUIRED_FIELD_SET:
+                field = next(f for f in _GB_REQUIRED_FIELDS if f not in data)
+                self.logger.warning(f"Missing required field: {field}")
+                return False
             
             # Validate words structure
             words = data.get("words", {})
@@ -44,11 +54,10 @@ class DataValidator:
                     return False
                 
                 # Check for required word data fields
-                required_word_fields = ["Std", "Prov", "OCR", "i"]
-                for field in required_word_fields:
-                    if field not in word_data:
-                        self.logger.warning(f"Missing required word field '{field}' for word '{word}'")
-                        return False
+                if not word_data.keys() >= _GB_REQUIRED_WORD_FIELD_SET:
+                    field = next(f for f in _GB_REQUIRED_WORD_FIELDS if f not in word_data)
+                    self.logger.warning(f"Missing required word field '{field}' for word '{word}'")
+                    return False
             
             return True
             
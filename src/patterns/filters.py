@@ -1,37 +1,43 @@
 """Pattern filtering utilities."""
 
-import re
-from typing import List, Set
+from typing import Iterable, List, Set
 
 from .generator import Pattern
 
+# Common stopwords that should be filtered out
+_STOPWORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", 
+    "of", "with", "by", "is", "are", "was", "were", "be", "been", "being",
+    "have", "has", "had", "do", "does", "did", "will", "would", "could",
+    "should", "may", "might", "must", "can", "this", "that", "these",
+    "those", "i", "you", "he", "she", "it", "we", "they", "me", "him",
+    "her", "us", "them", "my", "your", "his", "her", "its", "our", "their"
+})
+
 
 class PatternFilter:
     """Filter patterns based on various criteria."""
     
+    __slots__ = ("stopwords",)
+    
     def __init__(self):
         """Initialize pattern filter."""
-        # Common stopwords that should be filtered out
-        self.stopwords = {
-            "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", 
-            "of", "with", "by", "is", "are", "was", "were", "be", "been", "being",
-            "have", "has", "had", "do", "does", "did", "will", "would", "could",
-            "should", "may", "might", "must", "can", "this", "that", "these",
-            "those", "i", "you", "he", "she", "it", "we", "they", "me", "him",
-            "her", "us", "them", "my", "your", "his", "her", "its", "our", "their"
-        }
-        
-        # Pattern for non-alphanumeric characters
-        self.pattern_to_keep = re.compile(r"[^a-zA-Z0-9\s]")
+        # Shared module-level constants; nothing is rebuilt per instance
+        self.stopwords = _STOPWORDS
     
-    def filter_patterns(self, patterns: List[Pattern], min_length: int = 3) -> List[Pattern]:
+    def filter_patterns(self, patterns: Iterable[Pattern], min_length: int = 3) -> List[Pattern]:
         """Filter patterns based on length and stopwords."""
         filtered = []
         seen = set()
         
         for pattern in patterns:
-            # Extract the text from the pattern
-            pattern_text = " ".join([token.get("lower", "") for token in pattern.pattern])
+            # Extract the text from the pattern; single-token patterns (the
+            # common case) need no join
+            tokens = pattern.pattern
+            if len(tokens) == 1:
+                pattern_text = tokens[0].get("lower", "")
+            else:
+                pattern_text = " ".join([token.get("lower", "") for token in tokens])
             
             # Check if pattern meets criteria
             if self._is_valid_pattern(pattern_text, min_length, seen):
@@ -42,13 +48,14 @@ class PatternFilter:
     
     def _is_valid_pattern(self, pattern_text: str, min_length: int, seen: Set[str]) -> bool:
         """Check if pattern is valid."""
+        # Cheapest checks first: length before the seen set lookup
         if not pattern_text:
             return False
         
-        if pattern_text in seen:
+        if len(pattern_text) < min_length:
             return False
         
-        if len(pattern_text) < min_length:
+        if pattern_text in seen:
             return False
         
         if pattern_text in self.stopwords:
@@ -56,7 +63,7 @@ class PatternFilter:
         
         return True
     
-    def deduplicate_patterns(self, patterns: List[Pattern]) -> List[Pattern]:
+    def deduplicate_patterns(self, patterns: Iterable[Pattern]) -> List[Pattern]:
         """Remove duplicate patterns."""
         seen = set()
         unique_patterns = []
@@ -1,18 +1,37 @@
 """Pattern generation logic."""
 
-import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-import spacy
 from pydantic import BaseModel
 
 from config import get_settings
 from src.data.loaders import GBDataItem, create_loader
+from src.utils.jsonl import dumps, dumps_line
 from src.utils.logging import get_logger
+from src.utils.text import strip_punctuation
 
 logger = get_logger(__name__)
 
+# Buffer size for pattern output; the BufferedWriter batches the small
+# per-pattern writes into few large write syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Fixed JSON around the token of a single-token PHONETIC pattern, the shape
+# the generator emits; only the token text needs encoding
+_PHONETIC_PREFIX = b'{"label":"PHONETIC","pattern":[{"lower":'
+_PHONETIC_SUFFIX = b'}]}\n'
+
+
+@lru_cache(maxsize=None)
+def _load_spacy_stopwords() -> FrozenSet[str]:
+    """Load spaCy's English stopwords, importing spaCy on first use only."""
+    import spacy
+    
+    return frozenset(spacy.blank("en").Defaults.stop_words)
+
 
 class Pattern(BaseModel):
     """Pattern model for Prodigy."""
@@ -21,9 +40,18 @@ class Pattern(BaseModel):
     pattern: List[Dict[str, str]]
 
 
+def _generate_keyed_patterns_for_file(data_file: Path) -> List[Tuple[str, Pattern]]:
+    """Worker for generate_from_gb_files: one fresh generator per file."""
+    return list(PatternGenerator()._iter_keyed_patterns_from_gb_data(data_file))
+
+
 class PatternGenerator:
     """Generate patterns from phonetic data."""
     
+    __slots__ = (
+        "settings", "logger", "stopwords", "seen_patterns", "seen_words",
+    )
+    
     def __init__(self):
         """Initialize pattern generator."""
         self.settings = get_settings()
@@ -31,103 +59,193 @@ class PatternGenerator:
         
         # Initialize spaCy for stopword filtering
         if self.settings.patterns.enable_stopword_filter:
+            # spaCy is only imported when stopword filtering is enabled, and
+            # only once per process however many generators are created
             try:
-                self.nlp = spacy.blank("en")
-                self.stopwords = self.nlp.Defaults.stop_words
+                self.stopwords = _load_spacy_stopwords()
             except Exception as e:
                 self.logger.warning(f"Failed to load spaCy stopwords: {e}")
-                self.stopwords = set()
+                self.stopwords = frozenset()
         else:
-            self.stopwords = set()
-        
-        # Pattern to keep (non-alphanumeric characters)
-        self.pattern_to_keep = re.compile(r"[^a-zA-Z0-9\s]")
+            self.stopwords = frozenset()
         
         # Track seen patterns to avoid duplicates
         self.seen_patterns: Set[str] = set()
+        
+        # Track lowercased words already expanded into variants; variants
+        # depend only on the lowercased word, so a repeat (in any casing)
+        # can only yield variants that were already accepted or rejected
+        self.seen_words: Set[str] = set()
     
     def generate_from_gb_data(self, data_file: Path) -> List[Pattern]:
         """Generate patterns from GB data file."""
+        return list(self.iter_patterns_from_gb_data(data_file))
+    
+    def iter_patterns_from_gb_data(self, data_file: Path) -> Iterator[Pattern]:
+        """Lazily yield patterns from GB data file as items are loaded."""
+        for _, pattern in self._iter_keyed_patterns_from_gb_data(data_file):
+            yield pattern
+    
+    def _iter_keyed_patterns_from_gb_data(self, data_file: Path) -> Iterator[Tuple[str, Pattern]]:
+        """Yield (seen_patterns key, pattern) pairs from GB data file."""
         self.logger.info(f"Generating patterns from {data_file}")
         
-        patterns = []
         kept_count = 0
         
         try:
             loader = create_loader(data_file)
             for item in loader.load():
                 if isinstance(item, GBDataItem):
-                    item_patterns = self._extract_patterns_from_gb_item(item)
-                    patterns.extend(item_patterns)
+                    item_patterns = self._extract_keyed_patterns_from_gb_item(item)
                     kept_count += len(item_patterns)
+                    yield from item_patterns
             
             self.logger.info(f"Generated {kept_count} patterns from {data_file}")
-            return patterns
             
         except Exception as e:
             self.logger.error(f"Failed to generate patterns from {data_file}: {e}")
             raise
     
+    def generate_from_gb_files(self, data_files: Sequence[Path],
+                               max_workers: Optional[int] = None) -> Iterator[Pattern]:
+        """Generate patterns from several GB data files in parallel processes.
+        
+        Each file is handled by its own generator in a worker process; the
+        results are merged here in file order against ``seen_patterns``, so
+        the output matches running generate_from_gb_data over the files in
+        sequence with one generator.
+        """
+        if max_workers is None:
+            max_workers = self.settings.processing.max_workers
+        
+        self.logger.info(f"Generating patterns from {len(data_files)} files with {max_workers} workers")
+        
+        if max_workers <= 1 or len(data_files) <= 1:
+            # Nothing to parallelize; skip the process pool overhead
+            for data_file in data_files:
+                yield from self.iter_patterns_from_gb_data(data_file)
+            return
+        
+        seen_patterns = self.seen_patterns
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for file_patterns in executor.map(_generate_keyed_patterns_for_file, data_files):
+                for key, pattern in file_patterns:
+                    # Workers dedupe within a file on the variant string;
+                    # drop patterns an earlier file already produced, keyed
+                    # the same way
+                    if key not in seen_patterns:
+                        seen_patterns.add(key)
+                        yield pattern
+    
     def _extract_patterns_from_gb_item(self, item: GBDataItem) -> List[Pattern]:
         """Extract patterns from a single GB data item."""
+        return [pattern for _, pattern in self._extract_keyed_patterns_from_gb_item(item)]
+    
+    def _extract_keyed_patterns_from_gb_item(self, item: GBDataItem) -> List[Tuple[str, Pattern]]:
+        """Extract (variant, pattern) pairs from a single GB data item.
+        
+        The variant is the key recorded in ``seen_patterns``; it can differ
+        from the joined tokens when the variant has repeated whitespace.
+        """
         patterns = []
         
-        # Get words from the item
-        words = list(item.words.keys())
+        seen_words = self.seen_words
         
-        for word in words:
-            # Create variants (original and cleaned) - match original logic
-            variants = {
-                word.lower(),
-                self.pattern_to_keep.sub("", word.lower())
-            }
+        # Iterate the words dict directly; it is not modified, so no copy
+        # of its keys is needed
+        for word in item.words:
+            # Lowercase once; the result is both the memo key and the
+            # first variant
+            lowered = word.lower()
+            if lowered in seen_words:
+                continue
+            seen_words.add(lowered)
+            
+            # Create variants (original and cleaned), skipping the cleaned
+            # one when cleanup would not change anything. Plain ASCII
+            # alphanumeric words (the majority) skip the cleanup call.
+            if lowered.isascii() and lowered.isalnum():
+                variants: Tuple[str, ...] = (lowered,)
+            else:
+                cleaned = strip_punctuation(lowered)
+                variants = (lowered,) if cleaned == lowered else (lowered, cleaned)
             
+            # Only words the memo has not seen get here, so the check runs
+            # once per distinct word
             for variant in variants:
-                if self._is_valid_pattern(variant):
-                    # Split into tokens and create pattern - match original format
+                if not self._is_valid_pattern(variant):
+                    continue
+                
+                # Split into tokens and create pattern - match original format.
+                # Most variants are single words: isprintable() is False for
+                # every whitespace character except " ", so this skips split()
+                if " " not in variant and variant.isprintable():
+                    tokens = [{"lower": variant}]
+                else:
                     tokens = [{"lower": token} for token in variant.split()]
-                    pattern = Pattern(
-                        label="PHONETIC",
-                        pattern=tokens
-                    )
-                    patterns.append(pattern)
-                    self.seen_patterns.add(variant)
+                pattern = Pattern(
+                    label="PHONETIC",
+                    pattern=tokens
+                )
+                patterns.append((variant, pattern))
+                self.seen_patterns.add(variant)
         
         return patterns
     
     def _is_valid_pattern(self, pattern: str) -> bool:
         """Check if pattern is valid according to settings."""
+        # Cheapest checks first: length, then the seen set, then stopwords
+        # (an empty stopword set when the filter is disabled)
         if not pattern:
             return False
         
-        if pattern in self.seen_patterns:
+        length = len(pattern)
+        if length < self.settings.patterns.min_pattern_length:
             return False
         
-        if len(pattern) < self.settings.patterns.min_pattern_length:
+        if length > self.settings.patterns.max_pattern_length:
             return False
         
-        if len(pattern) > self.settings.patterns.max_pattern_length:
+        if pattern in self.seen_patterns:
             return False
         
-        if self.settings.patterns.enable_stopword_filter:
-            if pattern in self.stopwords:
-                return False
+        if pattern in self.stopwords:
+            return False
         
         return True
     
-    def save_patterns(self, patterns: List[Pattern], output_file: Path) -> None:
-        """Save patterns to JSONL file."""
-        self.logger.info(f"Saving {len(patterns)} patterns to {output_file}")
+    def save_patterns(self, patterns: Iterable[Pattern], output_file: Path) -> int:
+        """Save patterns to JSONL file and return the number written.
+        
+        ``patterns`` may be any iterable, including the lazy
+        ``iter_patterns_from_gb_data``, in which case patterns are written
+        as they are generated.
+        """
+        self.logger.info(f"Saving patterns to {output_file}")
+        
+        count = 0
         
         # Ensure output directory exists
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
+            with open(output_file, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+                write = f.write
                 for pattern in patterns:
-                    f.write(pattern.model_dump_json() + "\n")
+                    tokens = pattern.pattern
+                    if (pattern.label == "PHONETIC" and len(tokens) == 1
+                            and len(tokens[0]) == 1 and "lower" in tokens[0]):
+                        # Common case: splice the encoded token into the
+                        # fixed template, byte-identical to a full encode
+                        write(_PHONETIC_PREFIX + dumps(tokens[0]["lower"]) + _PHONETIC_SUFFIX)
+                    else:
+                        # Plain dict of the two fields: skips pydantic's
+                        # serializer, which costs more than orjson here
+                        write(dumps_line({"label": pattern.label, "pattern": tokens}))
+                    count += 1
             
-            self.logger.info(f"Successfully saved patterns to {output_file}")
+            self.logger.info(f"Successfully saved {count} patterns to {output_file}")
+            return count
             
         except Exception as e:
             self.logger.error(f"Failed to save patterns to {output_file}: {e}")
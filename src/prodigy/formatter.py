@@ -1,12 +1,27 @@
 """Prodigy data formatting utilities."""
 
+import os
+from datetime import datetime
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from src.data.loaders import GBDataItem, GeminiDataItem
+from src.data.loaders import GBDataItem, GeminiDataItem, GeminiDataLoader
+from src.utils.jsonl import dumps_line
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Meta skeleton for format_gemini_data, in output key order
+_GEMINI_META_TEMPLATE: Dict[str, Any] = {
+    "source": "gemini_data",
+    "source_file": None,
+    "speaker": None,
+    "speaker_in_char_list": None,
+    "addressee": None,
+    "addressee_in_char_list": None,
+    "is_dialogue": True,  # Gemini data is always dialogue
+}
+
 
 class ProdigyFormatter:
     """Format data for Prodigy annotation."""
@@ -32,21 +47,24 @@ class ProdigyFormatter:
             }
         }
     
-    def format_gemini_data(self, gemini_item: GeminiDataItem, is_phonetized: bool = False) -> Dict[str, Any]:
-        """Format Gemini data item for Prodigy."""
-        return {
-            "text": gemini_item.utterance,
-            "meta": {
-                "source": "gemini_data",
-                "source_file": gemini_item.source_file,
-                "speaker": gemini_item.speaker,
-                "speaker_in_char_list": gemini_item.speaker_in_char_list,
-                "addressee": gemini_item.addressee,
-                "addressee_in_char_list": gemini_item.addressee_in_char_list,
-                "is_dialogue": True,  # Gemini data is always dialogue
-                "is_phonetized": is_phonetized
-            }
-        }
+    def format_gemini_data(self, gemini_item: GeminiDataItem,
+                           is_phonetized: Optional[bool] = None) -> Dict[str, Any]:
+        """Format Gemini data item for Prodigy.
+        
+        ``is_phonetized`` is left out of the meta when it is ``None``, for
+        items that were never classified.
+        """
+        # Copy the fixed skeleton and overwrite the per-item fields; the
+        # copy keeps the template's key order, so the output is unchanged
+        meta = _GEMINI_META_TEMPLATE.copy()
+        meta["source_file"] = gemini_item.source_file
+        meta["speaker"] = gemini_item.speaker
+        meta["speaker_in_char_list"] = gemini_item.speaker_in_char_list
+        meta["addressee"] = gemini_item.addressee
+        meta["addressee_in_char_list"] = gemini_item.addressee_in_char_list
+        if is_phonetized is not None:
+            meta["is_phonetized"] = is_phonetized
+        return {"text": gemini_item.utterance, "meta": meta}
     
     def format_mixed_data(self, gb_items: List[GBDataItem], 
                          gemini_items: List[GeminiDataItem]) -> List[Dict[str, Any]]:
@@ -60,11 +78,39 @@ class ProdigyFormatter:
         
         # Format Gemini items (dialogue)
         for gemini_item in gemini_items:
-            formatted_item = self.format_gemini_data(gemini_item)
+            formatted_item = self.format_gemini_data(gemini_item, is_phonetized=False)
             formatted_items.append(formatted_item)
         
         return formatted_items
     
+    def format_gemini_file(self, input_file: Path, output_file: Path) -> int:
+        """Convert a Gemini JSONL file to Prodigy JSONL, returning the record count.
+        
+        Rows are written to a temporary file beside ``output_file`` that
+        replaces it only once the input has been read in full, so an output
+        path that is (or links to) the input never truncates it first. The
+        rows are not classified, so their meta carries no ``is_phonetized``.
+        """
+        count = 0
+        
+        format_item = self.format_gemini_data
+        temp_file = output_file.with_name(f".{output_file.name}.tmp")
+        
+        try:
+            # 1 MiB buffer so the per-record writes reach the OS in large blocks
+            with open(temp_file, "wb", buffering=1 << 20) as f:
+                write = f.write
+                for gemini_item in GeminiDataLoader(input_file).load():
+                    write(dumps_line(format_item(gemini_item)))
+                    count += 1
+            os.replace(temp_file, output_file)
+        except Exception:
+            temp_file.unlink(missing_ok=True)
+            raise
+        
+        self.logger.info(f"Converted {count} items from {input_file} to {output_file}")
+        return count
+    
     def _extract_phonetic_words(self, words: Dict[str, Any]) -> List[str]:
         """Extract phonetic words from GB data."""
         phonetic_words = []
@@ -77,27 +123,41 @@ class ProdigyFormatter:
         return phonetic_words
     
     def add_annotation_metadata(self, item: Dict[str, Any], 
-                               annotation_type: str = "phonetic") -> Dict[str, Any]:
-        """Add metadata for annotation tracking."""
-        if "meta" not in item:
-            item["meta"] = {}
+                               annotation_type: str = "phonetic",
+                               created_at: Optional[str] = None) -> Dict[str, Any]:
+        """Add metadata for annotation tracking.
+        
+        ``created_at`` defaults to the current time; callers annotating
+        several items can pass one shared timestamp instead.
+        """
+        if created_at is None:
+            created_at = self._get_timestamp()
+        
+        # Look the meta dict up once and fill it in place
+        try:
+            meta = item["meta"]
+        except KeyError:
+            meta = item["meta"] = {}
         
-        item["meta"]["annotation_type"] = annotation_type
-        item["meta"]["annotation_status"] = "pending"
-        item["meta"]["created_at"] = self._get_timestamp()
+        meta["annotation_type"] = annotation_type
+        meta["annotation_status"] = "pending"
+        meta["created_at"] = created_at
         
         return item
     
     def _get_timestamp(self) -> str:
         """Get current timestamp."""
-        from datetime import datetime
         return datetime.now().isoformat()
     
     def validate_prodigy_format(self, item: Dict[str, Any]) -> bool:
         """Validate that item is in correct Prodigy format."""
-        required_fields = ["text", "meta"]
+        # Happy path: exact str/dict values need no loop and no messages;
+        # anything else goes through the checks below, which also accept
+        # subclasses and report what is wrong
+        if type(item.get("text")) is str and type(item.get("meta")) is dict:
+            return True
         
-        for field in required_fields:
+        for field in ("text", "meta"):
             if field not in item:
                 self.logger.warning(f"Missing required field: {field}")
                 return False
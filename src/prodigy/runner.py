@@ -1,18 +1,33 @@
 """Prodigy execution utilities."""
 
+import logging
+import re
+import shlex
 import subprocess
 import sys
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Sequence, Dict, Any
 
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# One db-stats line mentioning "total" (preferred) or "annotated" and
+# ending in an integer token; same rules as splitting each line and
+# parsing its last token
+_DB_STATS_LINE_RE = re.compile(
+    r"^(?:.*?(?P<total>total)|.*?annotated)"
+    r".*?(?<!\S)(?P<value>[+-]?\d+(?:_\d+)*)[^\S\n]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
 
 class ProdigyRunner:
     """Run Prodigy commands programmatically."""
     
+    # Labels offered when a recipe is run without explicit labels
+    DEFAULT_LABELS = ("PHONETIC", "DIALECT", "SLANG")
+    
     def __init__(self, prodigy_path: Optional[str] = None):
         """Initialize Prodigy runner."""
         self.prodigy_path = prodigy_path or "prodigy"
@@ -23,72 +38,44 @@ class ProdigyRunner:
                         model: str,
                         input_file: Path,
                         patterns_file: Optional[Path] = None,
-                        labels: List[str] = None,
+                        labels: Optional[Sequence[str]] = None,
                         host: str = "localhost",
                         port: int = 8080,
                         **kwargs) -> subprocess.Popen:
         """Run Prodigy spans.manual command."""
         
-        if labels is None:
-            labels = ["PHONETIC", "DIALECT", "SLANG"]
-        
-        # Build command
-        cmd = [
-            self.prodigy_path,
-            "spans.manual",
-            db_name,
-            model,
-            str(input_file),
-            "--loader", "jsonl",
-            "--label", ",".join(labels),
-            "--host", host,
-            "--port", str(port)
-        ]
-        
-        # Add patterns file if provided
-        if patterns_file and patterns_file.exists():
-            cmd.extend(["--patterns", str(patterns_file)])
-        
-        # Add additional arguments
-        for key, value in kwargs.items():
-            if value is not None:
-                cmd.extend([f"--{key}", str(value)])
-        
-        self.logger.info(f"Running Prodigy command: {' '.join(cmd)}")
-        
-        try:
-            # Run the command
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            return process
-            
-        except Exception as e:
-            self.logger.error(f"Failed to run Prodigy command: {e}")
-            raise
+        cmd = self._build_manual_command(
+            "spans.manual", db_name, model, input_file, patterns_file, labels, host, port, kwargs
+        )
+        return self._launch(cmd)
     
     def run_ner_manual(self,
                       db_name: str,
                       model: str,
                       input_file: Path,
                       patterns_file: Optional[Path] = None,
-                      labels: List[str] = None,
+                      labels: Optional[Sequence[str]] = None,
                       host: str = "localhost",
                       port: int = 8080,
                       **kwargs) -> subprocess.Popen:
         """Run Prodigy ner.manual command."""
         
+        cmd = self._build_manual_command(
+            "ner.manual", db_name, model, input_file, patterns_file, labels, host, port, kwargs
+        )
+        return self._launch(cmd)
+    
+    def _build_manual_command(self, recipe: str, db_name: str, model: str, input_file: Path,
+                              patterns_file: Optional[Path], labels: Optional[Sequence[str]],
+                              host: str, port: int, extra_args: Dict[str, Any]) -> List[str]:
+        """Build the argument list shared by the manual annotation recipes."""
         if labels is None:
-            labels = ["PHONETIC", "DIALECT", "SLANG"]
+            labels = self.DEFAULT_LABELS
         
         # Build command
         cmd = [
             self.prodigy_path,
-            "ner.manual",
+            recipe,
             db_name,
             model,
             str(input_file),
@@ -103,11 +90,17 @@ class ProdigyRunner:
             cmd.extend(["--patterns", str(patterns_file)])
         
         # Add additional arguments
-        for key, value in kwargs.items():
+        for key, value in extra_args.items():
             if value is not None:
                 cmd.extend([f"--{key}", str(value)])
         
-        self.logger.info(f"Running Prodigy command: {' '.join(cmd)}")
+        return cmd
+    
+    def _launch(self, cmd: List[str]) -> subprocess.Popen:
+        """Start a Prodigy command with captured output."""
+        # Only build the shell-quoted command line when INFO is enabled
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"Running Prodigy command: {shlex.join(cmd)}")
         
         try:
             # Run the command
@@ -127,18 +120,20 @@ class ProdigyRunner:
     def check_prodigy_installation(self) -> bool:
         """Check if Prodigy is properly installed."""
         try:
+            # Output is captured as bytes and only decoded when it is logged
             result = subprocess.run(
                 [self.prodigy_path, "--version"],
                 capture_output=True,
-                text=True,
                 timeout=10
             )
             
             if result.returncode == 0:
-                self.logger.info(f"Prodigy version: {result.stdout.strip()}")
+                if self.logger.isEnabledFor(logging.INFO):
+                    version = result.stdout.strip().decode("utf-8", "replace")
+                    self.logger.info(f"Prodigy version: {version}")
                 return True
             else:
-                self.logger.error(f"Prodigy check failed: {result.stderr}")
+                self.logger.error(f"Prodigy check failed: {result.stderr.decode('utf-8', 'replace')}")
                 return False
                 
         except Exception as e:
@@ -163,18 +158,10 @@ class ProdigyRunner:
                     "pending_examples": 0
                 }
                 
-                # Parse the output to extract statistics
-                for line in result.stdout.split('\n'):
-                    if 'total' in line.lower():
-                        try:
-                            stats["total_examples"] = int(line.split()[-1])
-                        except (ValueError, IndexError):
-                            pass
-                    elif 'annotated' in line.lower():
-                        try:
-                            stats["annotated_examples"] = int(line.split()[-1])
-                        except (ValueError, IndexError):
-                            pass
+                # Parse the output to extract statistics; later lines win
+                for match in _DB_STATS_LINE_RE.finditer(result.stdout):
+                    key = "total_examples" if match.group("total") else "annotated_examples"
+                    stats[key] = int(match.group("value"))
                 
                 stats["pending_examples"] = stats["total_examples"] - stats["annotated_examples"]
                 
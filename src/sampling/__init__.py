@@ -1,11 +1,12 @@
 """Sampling module for balanced data selection."""
 
-from .strategies import SamplingStrategy, RandomSampler, StratifiedSampler
+from .strategies import ClassifiedBatch, SamplingStrategy, RandomSampler, StratifiedSampler
 from .balancer import DataBalancer
 
 __all__ = [
     "SamplingStrategy",
     "RandomSampler", 
     "StratifiedSampler",
+    "ClassifiedBatch",
     "DataBalancer",
 ]
@@ -1,11 +1,14 @@
 """Data balancing utilities for 50/50 splits."""
 
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from src.data.loaders import GBDataLoader, GeminiDataLoader, create_loader
+from src.data.loaders import GBDataItem, GBDataLoader, GeminiDataItem, GeminiDataLoader, create_loader
 from src.sampling.strategies import StratifiedSampler, RandomSampler
 from src.prodigy.formatter import ProdigyFormatter
+from src.utils.dispatch import TypeDispatch
+from src.utils.jsonl import dumps_line
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -22,20 +25,24 @@ class DataBalancer:
         self.sampler = StratifiedSampler(random_seed=random_seed, patterns_file=patterns_file, 
                                         exceptions_file=exceptions_file)
         self.formatter = ProdigyFormatter()
+        
+        # Converter for _convert_to_prodigy_format, by item type
+        self._converters = TypeDispatch(
+            {GBDataItem: self._convert_gb_item, GeminiDataItem: self._convert_gemini_item},
+            default=self._convert_unknown_item,
+        )
     
     def balance_gb_data(self, data_file: Path, sample_size: int, 
                        dialogue_ratio: float = 0.5) -> List[Any]:
         """Balance GB data with specified dialogue ratio."""
         self.logger.info(f"Balancing GB data from {data_file}")
         
-        # Load data
+        # Stream the file into the sampler, which keeps at most
+        # sample_size items per class in memory
         loader = create_loader(data_file)
-        data = list(loader.load())
-        
-        self.logger.info(f"Loaded {len(data)} items from {data_file}")
         
         # Sample with balanced ratio
-        balanced_data = self.sampler.sample(data, sample_size, dialogue_ratio)
+        balanced_data = self.sampler.sample(loader.load(), sample_size, dialogue_ratio)
         
         self.logger.info(f"Balanced sample contains {len(balanced_data)} items")
         
@@ -46,14 +53,9 @@ class DataBalancer:
         """Balance Gemini data with specified phonetized/non-phonetized ratio."""
         self.logger.info(f"Balancing Gemini data from {len(data_files)} files")
         
-        # Load all data
-        all_data = []
-        for data_file in data_files:
-            loader = create_loader(data_file)
-            data = list(loader.load())
-            all_data.extend(data)
-        
-        self.logger.info(f"Loaded {len(all_data)} items from Gemini files")
+        # Stream all files into the sampler one after another instead of
+        # loading them into one list first
+        all_data = self._iter_files(data_files)
         
         # Sample with balanced phonetized/non-phonetized ratio
         balanced_data = self.sampler.sample_phonetized_dialogue(all_data, sample_size, phonetized_ratio)
@@ -65,50 +67,91 @@ class DataBalancer:
     def balance_mixed_data(self, gb_file: Path, gemini_files: List[Path], 
                           sample_size: int, dialogue_ratio: float = 0.5) -> Tuple[List[Any], List[Any]]:
         """Balance mixed data sources."""
+        labeled_gb, labeled_gemini = self._sample_mixed_labeled(
+            gb_file, gemini_files, sample_size, dialogue_ratio
+        )
+        return [item for item, _ in labeled_gb], [item for item, _ in labeled_gemini]
+    
+    def _sample_mixed_labeled(self, gb_file: Path, gemini_files: List[Path], sample_size: int,
+                              dialogue_ratio: float) -> Tuple[List[Tuple[Any, bool]], List[Tuple[Any, bool]]]:
+        """Sample both sources, pairing each kept item with its dialogue label."""
         self.logger.info("Balancing mixed data sources")
         
-        # Load GB data (non-dialogue)
-        gb_loader = create_loader(gb_file)
-        gb_data = list(gb_loader.load())
-        
-        # Load Gemini data (dialogue)
-        gemini_data = []
-        for gemini_file in gemini_files:
-            loader = create_loader(gemini_file)
-            data = list(loader.load())
-            gemini_data.extend(data)
-        
-        self.logger.info(f"Loaded {len(gb_data)} GB items and {len(gemini_data)} Gemini items")
-        
         # Calculate sample sizes
         dialogue_sample_size = int(sample_size * dialogue_ratio)
         non_dialogue_sample_size = sample_size - dialogue_sample_size
         
-        # Sample from each source
-        sampled_gb = self.sampler.sample(gb_data, non_dialogue_sample_size, 0.0)  # 0% dialogue for GB
-        sampled_gemini = self.sampler.sample(gemini_data, dialogue_sample_size, 1.0)  # 100% dialogue for Gemini
+        # Sample from each source, streaming the files into the sampler
+        gb_data = create_loader(gb_file).load()  # Non-dialogue
+        gemini_data = self._iter_files(gemini_files)  # Dialogue
+        labeled_gb = self.sampler.sample_labeled(gb_data, non_dialogue_sample_size, 0.0)  # 0% dialogue for GB
+        labeled_gemini = self.sampler.sample_labeled(gemini_data, dialogue_sample_size, 1.0)  # 100% dialogue for Gemini
         
-        self.logger.info(f"Sampled {len(sampled_gb)} GB items and {len(sampled_gemini)} Gemini items")
+        self.logger.info(f"Sampled {len(labeled_gb)} GB items and {len(labeled_gemini)} Gemini items")
         
-        return sampled_gb, sampled_gemini
+        return labeled_gb, labeled_gemini
+    
+    def _iter_files(self, data_files: Iterable[Path]) -> Iterator[Any]:
+        """Chain the items of several data files into one lazy stream."""
+        return chain.from_iterable(create_loader(data_file).load() for data_file in data_files)
+    
+    def balance_mixed_stream(self, gb_file: Path, gemini_files: List[Path],
+                             sample_size: int, dialogue_ratio: float = 0.5
+                             ) -> Tuple[Iterator[Dict[str, Any]], Dict[str, Any]]:
+        """Balance mixed data sources, returning lazy Prodigy rows and stats.
+        
+        Each source is read once, straight into the sampler's per-class
+        reservoirs. Every kept item is classified exactly once more, for
+        ``is_phonetized``; that label feeds both the statistics and the
+        row, and the dialogue label comes from the reservoir the item was
+        kept in. Rows are formatted one at a time as the caller consumes
+        them; pass them to ``save_prodigy_rows`` to write them without
+        building a list.
+        """
+        labeled_gb, labeled_gemini = self._sample_mixed_labeled(
+            gb_file, gemini_files, sample_size, dialogue_ratio
+        )
+        is_phonetized = self.sampler._is_phonetized_sample
+        labeled = [
+            (item, is_dialogue, is_phonetized(item))
+            for item, is_dialogue in chain(labeled_gb, labeled_gemini)
+        ]
+        stats = self._balance_statistics(len(labeled), sum(phonetized for _, _, phonetized in labeled))
+        rows = (self._format_labeled(*entry) for entry in labeled)
+        return rows, stats
+    
+    def _format_labeled(self, item: Any, is_dialogue: bool, is_phonetized: bool) -> Dict[str, Any]:
+        """Format a sampled item from labels that are already known."""
+        if isinstance(item, GBDataItem):
+            return self.formatter.format_gb_data(item, is_dialogue=is_dialogue)
+        if isinstance(item, GeminiDataItem):
+            return self.formatter.format_gemini_data(item, is_phonetized=is_phonetized)
+        return self._convert_unknown_item(item)
     
     def save_balanced_data(self, data: List[Any], output_file: Path) -> None:
         """Save balanced data to file."""
         self.logger.info(f"Saving {len(data)} balanced items to {output_file}")
         
+        # Convert to Prodigy format with proper meta fields as rows are written
+        self.save_prodigy_rows(map(self._convert_to_prodigy_format, data), output_file)
+    
+    def save_prodigy_rows(self, rows: Iterable[Dict[str, Any]], output_file: Path) -> int:
+        """Write already formatted Prodigy rows to JSONL, returning the count."""
+        count = 0
+        
         # Ensure output directory exists
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                for item in data:
-                    # Convert to Prodigy format with proper meta fields
-                    prodigy_item = self._convert_to_prodigy_format(item)
-                    
-                    import json
-                    f.write(json.dumps(prodigy_item, ensure_ascii=False) + "\n")
+            # 1 MiB buffer so the per-record writes reach the OS in large blocks
+            with open(output_file, "wb", buffering=1 << 20) as f:
+                write = f.write
+                for row in rows:
+                    write(dumps_line(row))
+                    count += 1
             
             self.logger.info(f"Successfully saved balanced data to {output_file}")
+            return count
             
         except Exception as e:
             self.logger.error(f"Failed to save balanced data to {output_file}: {e}")
@@ -116,40 +159,38 @@ class DataBalancer:
     
     def _convert_to_prodigy_format(self, item: Any) -> Dict[str, Any]:
         """Convert data item to Prodigy format with proper meta fields."""
-        from src.data.loaders import GBDataItem, GeminiDataItem
-        
-        if isinstance(item, GBDataItem):
-            # Use the formatter for GB data
-            is_dialogue = self.sampler._is_dialogue_sample(item)
-            return self.formatter.format_gb_data(item, is_dialogue=is_dialogue)
-        
-        elif isinstance(item, GeminiDataItem):
-            # Use the formatter for Gemini data
-            is_phonetized = self.sampler._is_phonetized_sample(item)
-            return self.formatter.format_gemini_data(item, is_phonetized=is_phonetized)
-        
-        else:
-            # Fallback for unknown types
-            return {
-                "text": str(item),
-                "meta": {
-                    "source": "unknown",
-                    "is_dialogue": False
-                }
+        return self._converters(item)
+    
+    def _convert_gb_item(self, item: GBDataItem) -> Dict[str, Any]:
+        """Use the formatter for GB data."""
+        is_dialogue = self.sampler._is_dialogue_sample(item)
+        return self.formatter.format_gb_data(item, is_dialogue=is_dialogue)
+    
+    def _convert_gemini_item(self, item: GeminiDataItem) -> Dict[str, Any]:
+        """Use the formatter for Gemini data."""
+        is_phonetized = self.sampler._is_phonetized_sample(item)
+        return self.formatter.format_gemini_data(item, is_phonetized=is_phonetized)
+    
+    def _convert_unknown_item(self, item: Any) -> Dict[str, Any]:
+        """Fallback for unknown types."""
+        return {
+            "text": str(item),
+            "meta": {
+                "source": "unknown",
+                "is_dialogue": False
             }
+        }
     
     def get_balance_statistics(self, data: List[Any]) -> Dict[str, int]:
         """Get statistics about data balance."""
-        phonetized_count = 0
-        non_phonetized_count = 0
-        
-        for item in data:
-            if self.sampler._is_phonetized_sample(item):
-                phonetized_count += 1
-            else:
-                non_phonetized_count += 1
+        # Count in C via sum(map(...)) over the per-item bools
+        return self._balance_statistics(len(data), sum(map(self.sampler._is_phonetized_sample, data)))
+    
+    def _balance_statistics(self, total: int, phonetized_count: int) -> Dict[str, int]:
+        """Build the statistics dict from the total and phonetized counts."""
+        # The complement follows from the total
+        non_phonetized_count = total - phonetized_count
         
-        total = len(data)
         phonetized_ratio = phonetized_count / total if total > 0 else 0
         
         return {
@@ -1,17 +1,83 @@
 """Sampling strategies for balanced data selection."""
 
-import json
+import math
 import random
+import re
 from abc import ABC, abstractmethod
 from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
 
 from src.data.loaders import GBDataItem, GeminiDataItem
+from src.utils.dispatch import TypeDispatch
+from src.utils.jsonl import iter_lines, loads
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Dialogue markers for StratifiedSampler._is_dialogue_sample, each group
+# ordered by how often the marker decides a GB sample (apostrophes are the
+# most common quote, "said" by far the most common verb)
+_DIALOGUE_QUOTES = ("'", '"')
+_DIALOGUE_VERBS = ('said', 'asked', 'replied', 'answered', 'exclaimed')
+
+# Characters dropped from words before matching them against the phonetic
+# patterns: anything but alphanumerics, apostrophes and hyphens. Whitespace
+# is kept so the cleaned utterance can still be split into words.
+_NON_PATTERN_CHAR_RE = re.compile(r"[^\w\s'-]|_")
+
+# The same character set restricted to ASCII, as a bytes.translate deletion
+# table
+_ASCII_NON_PATTERN_CHARS = bytes(
+    i for i in range(128)
+    if not (chr(i).isalnum() or chr(i).isspace() or chr(i) in "'-")
+)
+
+
+def _strip_non_pattern_chars(text: str) -> str:
+    """Remove the characters matched by ``_NON_PATTERN_CHAR_RE``.
+    
+    ASCII text, the common case, takes a single C-level ``bytes.translate``
+    pass instead of the regex.
+    """
+    if text.isascii():
+        return text.encode("ascii").translate(None, _ASCII_NON_PATTERN_CHARS).decode("ascii")
+    
+    return _NON_PATTERN_CHAR_RE.sub("", text)
+
+
+def _never(item: Any) -> bool:
+    """Classifier for item types that are never dialogue or phonetized."""
+    return False
+
+
+def _unit_weight(item: Any) -> float:
+    """Weight for item types WeightedSampler has no measure for."""
+    return 1.0
+
+
+def _open_uniform(rand: Callable[[], float]) -> float:
+    """Draw a uniform float from the open interval (0, 1) using ``rand``."""
+    u = rand()
+    while not u:
+        u = rand()
+    return u
+
+
+def _reservoir_advance(log_weight: float, seen: int, capacity: int,
+                       rand: Callable[[], float]) -> Tuple[float, int]:
+    """Take one Algorithm L step for a full reservoir.
+    
+    Returns the updated log of the weight W and the stream position of the
+    next item to replace a slot. W is kept in log space, so
+    ``1 - W = -expm1(log W)`` stays accurate when W is close to 1.
+    """
+    log_weight += math.log(_open_uniform(rand)) / capacity
+    skip = int(math.log(_open_uniform(rand)) / math.log(-math.expm1(log_weight)))
+    return log_weight, seen + skip + 1
+
 
 class SamplingStrategy(ABC):
     """Abstract base class for sampling strategies."""
@@ -19,10 +85,33 @@ class SamplingStrategy(ABC):
     def __init__(self, random_seed: Optional[int] = None):
         """Initialize sampling strategy."""
         self.random_seed = random_seed
-        if random_seed is not None:
-            random.seed(random_seed)
+        # Generators owned by this sampler, so samplers do not share or
+        # reseed the global random state: one for the per-item reservoir
+        # draws, one for the numpy index draws and shuffles. Both come from
+        # the same seed so runs stay reproducible.
+        self._random = random.Random(random_seed)
+        self.rng = np.random.default_rng(random_seed)
         self.logger = get_logger(self.__class__.__name__)
     
+    def _choose(self, items: List[Any], k: int) -> List[Any]:
+        """Pick ``k`` distinct items uniformly at random.
+        
+        Same contract as ``random.sample``, but the index permutation is
+        drawn by numpy in C, several times faster for large ``k``.
+        """
+        if k <= 0:
+            return []
+        indices = self.rng.choice(len(items), size=k, replace=False).tolist()
+        return [items[i] for i in indices]
+    
+    def _shuffled(self, items: List[Any]) -> List[Any]:
+        """Return ``items`` in a random order.
+        
+        Like ``random.shuffle`` but not in place; the permutation is drawn
+        by numpy in C instead of one Python-level call per swap.
+        """
+        return [items[i] for i in self.rng.permutation(len(items)).tolist()]
+    
     @abstractmethod
     def sample(self, data: List[Any], sample_size: int) -> List[Any]:
         """Sample data according to the strategy."""
@@ -37,7 +126,36 @@ class RandomSampler(SamplingStrategy):
         if len(data) <= sample_size:
             return data
         
-        return random.sample(data, sample_size)
+        return self._choose(data, sample_size)
+
+
+class ClassifiedBatch:
+    """Items together with their class labels, computed once.
+    
+    Built by ``StratifiedSampler.preclassify``. Passing a batch instead of
+    raw data to ``sample`` or ``sample_phonetized_dialogue`` skips
+    classification, so a pipeline that draws both kinds of sample from
+    the same data classifies each item only once.
+    """
+    
+    __slots__ = ("items", "dialogue_mask", "phonetized_mask")
+    
+    def __init__(self, items: List[Any], dialogue_mask: np.ndarray, phonetized_mask: np.ndarray):
+        """Initialize batch from items and one boolean mask per class."""
+        self.items = items
+        self.dialogue_mask = dialogue_mask
+        self.phonetized_mask = phonetized_mask
+    
+    def __len__(self) -> int:
+        """Number of items in the batch."""
+        return len(self.items)
+    
+    def partition(self, mask: np.ndarray) -> Tuple[List[Any], int, List[Any], int]:
+        """Split the items by ``mask``, in the shape ``_partition_reservoirs`` returns."""
+        items = self.items
+        matching = [items[i] for i in np.flatnonzero(mask).tolist()]
+        rest = [items[i] for i in np.flatnonzero(~mask).tolist()]
+        return matching, len(matching), rest, len(rest)
 
 
 class StratifiedSampler(SamplingStrategy):
@@ -49,29 +167,48 @@ class StratifiedSampler(SamplingStrategy):
         super().__init__(random_seed)
         self.logger = get_logger(self.__class__.__name__)
         # Load exceptions first, then patterns (so exceptions can filter patterns)
-        self.exceptions = self._load_exceptions(exceptions_file) if exceptions_file else set()
-        self.phonetic_patterns = self._load_patterns(patterns_file) if patterns_file else set()
+        self.exceptions = self._load_exceptions(exceptions_file) if exceptions_file else frozenset()
+        self.phonetic_patterns = self._load_patterns(patterns_file) if patterns_file else frozenset()
         self.pattern_usage = Counter()  # Track which patterns are used for filtering
+        
+        # Classifiers by item type; unknown types are neither dialogue nor
+        # phonetized
+        self._dialogue_checks = TypeDispatch(
+            {GBDataItem: self._is_dialogue_gb_item, GeminiDataItem: self._is_dialogue_gemini_item},
+            default=_never,
+        )
+        self._phonetized_checks = TypeDispatch(
+            {GBDataItem: self._is_phonetized_gb_item, GeminiDataItem: self._is_phonetized_gemini_item},
+            default=_never,
+        )
     
-    def _load_patterns(self, patterns_file: Path) -> Set[str]:
+    def _load_patterns(self, patterns_file: Path) -> FrozenSet[str]:
         """Load phonetic patterns from patterns.jsonl file, filtering out exceptions."""
         patterns = set()
+        failed = False
         try:
-            with open(patterns_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        pattern_data = json.loads(line)
-                        if 'pattern' in pattern_data and pattern_data['pattern']:
-                            # Extract the actual pattern text (lowercased)
-                            pattern_text = pattern_data['pattern'][0].get('lower', '')
-                            if pattern_text and pattern_text not in self.exceptions:
-                                patterns.add(pattern_text)
-            self.logger.info(f"Loaded {len(patterns)} phonetic patterns from {patterns_file} (filtered from exceptions)")
+            # Raw bytes straight into the JSON parser; no text decoding pass
+            for line in iter_lines(patterns_file):
+                if not line.isspace():
+                    pattern_data = loads(line)
+                    if 'pattern' in pattern_data and pattern_data['pattern']:
+                        # Extract the actual pattern text (lowercased)
+                        patterns.add(pattern_data['pattern'][0].get('lower', ''))
         except Exception as e:
+            failed = True
             self.logger.error(f"Error loading patterns from {patterns_file}: {e}")
-        return patterns
+        
+        # Filter out exceptions and empty texts with one set difference
+        # instead of a membership test per line; after a read error this
+        # still applies to the patterns loaded so far
+        patterns -= self.exceptions
+        patterns.discard('')
+        if not failed:
+            self.logger.info(f"Loaded {len(patterns)} phonetic patterns from {patterns_file} (filtered from exceptions)")
+        # Read-only from here on; the classifiers only test membership
+        return frozenset(patterns)
     
-    def _load_exceptions(self, exceptions_file: Path) -> Set[str]:
+    def _load_exceptions(self, exceptions_file: Path) -> FrozenSet[str]:
         """Load exception words from text file."""
         exceptions = set()
         try:
@@ -83,95 +220,163 @@ class StratifiedSampler(SamplingStrategy):
             self.logger.info(f"Loaded {len(exceptions)} exception words from {exceptions_file}")
         except Exception as e:
             self.logger.error(f"Error loading exceptions from {exceptions_file}: {e}")
-        return exceptions
+        return frozenset(exceptions)
     
-    def sample(self, data: List[Any], sample_size: int, 
-               dialogue_ratio: float = 0.5) -> List[Any]:
-        """Sample data with balanced dialogue/non-dialogue ratio."""
-        
-        # Separate dialogue and non-dialogue samples
-        dialogue_samples = []
-        non_dialogue_samples = []
+    def _partition_reservoirs(self, data: Iterable[Any], predicate: Callable[[Any], bool],
+                              capacity: int) -> Tuple[List[Any], int, List[Any], int]:
+        """Split a stream into two classes, keeping a uniform sample of each.
+        
+        Returns ``(matching, matching_count, rest, rest_count)``. Each list
+        is a reservoir sample of at most ``capacity`` items from its class,
+        so memory stays O(capacity) however long the stream is. A class
+        with no more than ``capacity`` items is kept whole, in order.
+        
+        Uses Algorithm L: once a reservoir is full, the position of the
+        next item that replaces a slot is drawn ahead of time, so items in
+        between are only counted, with no random draw per item.
+        """
+        # Per-class state, indexed 0 for matching items and 1 for the rest
+        reservoirs: Tuple[List[Any], List[Any]] = ([], [])
+        counts = [0, 0]
+        log_weights = [0.0, 0.0]
+        next_replace = [0, 0]
+        randrange = self._random.randrange
+        rand = self._random.random
         
         for item in data:
-            if self._is_dialogue_sample(item):
-                dialogue_samples.append(item)
-            else:
-                non_dialogue_samples.append(item)
+            cls = 0 if predicate(item) else 1
+            seen = counts[cls] + 1
+            counts[cls] = seen
+            
+            if seen <= capacity:
+                reservoirs[cls].append(item)
+                if seen == capacity:
+                    log_weights[cls], next_replace[cls] = _reservoir_advance(0.0, seen, capacity, rand)
+            elif seen == next_replace[cls]:
+                reservoirs[cls][randrange(capacity)] = item
+                log_weights[cls], next_replace[cls] = _reservoir_advance(log_weights[cls], seen, capacity, rand)
+        
+        return reservoirs[0], counts[0], reservoirs[1], counts[1]
+    
+    def preclassify(self, data: Iterable[Any]) -> ClassifiedBatch:
+        """Classify every item once, for use with several sample calls.
+        
+        Pattern usage is counted here, once per item, rather than by each
+        later sample call.
+        """
+        items = list(data)
+        count = len(items)
+        dialogue_mask = np.fromiter(map(self._is_dialogue_sample, items), dtype=bool, count=count)
+        phonetized_mask = np.fromiter(map(self._is_phonetized_sample, items), dtype=bool, count=count)
+        return ClassifiedBatch(items, dialogue_mask, phonetized_mask)
+    
+    def sample(self, data: Union[Iterable[Any], ClassifiedBatch], sample_size: int, 
+               dialogue_ratio: float = 0.5) -> List[Any]:
+        """Sample data with balanced dialogue/non-dialogue ratio.
+        
+        ``data`` may be any iterable, including a lazy loader stream; only
+        up to ``sample_size`` items per class are held in memory. A
+        ``ClassifiedBatch`` from ``preclassify`` is also accepted and is
+        split by its stored labels instead.
+        """
+        return [item for item, _ in self.sample_labeled(data, sample_size, dialogue_ratio)]
+    
+    def sample_labeled(self, data: Union[Iterable[Any], ClassifiedBatch], sample_size: int,
+                       dialogue_ratio: float = 0.5) -> List[Tuple[Any, bool]]:
+        """Like ``sample``, but pair each item with its dialogue label.
+        
+        The label is the class the item was sampled from, so callers that
+        need it do not have to classify the sampled items again.
+        """
+        
+        # Separate dialogue and non-dialogue samples; neither class can
+        # contribute more than sample_size items
+        if isinstance(data, ClassifiedBatch):
+            dialogue_samples, dialogue_count, non_dialogue_samples, non_dialogue_count = (
+                data.partition(data.dialogue_mask)
+            )
+        else:
+            dialogue_samples, dialogue_count, non_dialogue_samples, non_dialogue_count = (
+                self._partition_reservoirs(data, self._is_dialogue_sample, sample_size)
+            )
         
-        self.logger.info(f"Found {len(dialogue_samples)} dialogue samples")
-        self.logger.info(f"Found {len(non_dialogue_samples)} non-dialogue samples")
+        self.logger.info(f"Found {dialogue_count} dialogue samples")
+        self.logger.info(f"Found {non_dialogue_count} non-dialogue samples")
         
         # Calculate sample sizes for each class
         dialogue_sample_size = int(sample_size * dialogue_ratio)
         non_dialogue_sample_size = sample_size - dialogue_sample_size
         
         # Adjust if we don't have enough samples
-        if len(dialogue_samples) < dialogue_sample_size:
-            dialogue_sample_size = len(dialogue_samples)
+        if dialogue_count < dialogue_sample_size:
+            dialogue_sample_size = dialogue_count
             non_dialogue_sample_size = sample_size - dialogue_sample_size
             self.logger.warning(f"Not enough dialogue samples, using {dialogue_sample_size}")
         
-        if len(non_dialogue_samples) < non_dialogue_sample_size:
-            non_dialogue_sample_size = len(non_dialogue_samples)
+        if non_dialogue_count < non_dialogue_sample_size:
+            non_dialogue_sample_size = non_dialogue_count
             dialogue_sample_size = sample_size - non_dialogue_sample_size
             self.logger.warning(f"Not enough non-dialogue samples, using {non_dialogue_sample_size}")
         
         # Sample from each class
-        sampled_dialogue = random.sample(dialogue_samples, dialogue_sample_size) if dialogue_sample_size > 0 else []
-        sampled_non_dialogue = random.sample(non_dialogue_samples, non_dialogue_sample_size) if non_dialogue_sample_size > 0 else []
+        sampled_dialogue = self._choose(dialogue_samples, dialogue_sample_size)
+        sampled_non_dialogue = self._choose(non_dialogue_samples, non_dialogue_sample_size)
         
-        # Combine samples
-        result = sampled_dialogue + sampled_non_dialogue
-        
-        # Shuffle the result
-        random.shuffle(result)
+        # Combine samples and shuffle the result
+        result = self._shuffled(
+            [(item, True) for item in sampled_dialogue]
+            + [(item, False) for item in sampled_non_dialogue]
+        )
         
         self.logger.info(f"Sampled {len(sampled_dialogue)} dialogue and {len(sampled_non_dialogue)} non-dialogue samples")
         
         return result
     
-    def sample_phonetized_dialogue(self, data: List[Any], sample_size: int, 
+    def sample_phonetized_dialogue(self, data: Union[Iterable[Any], ClassifiedBatch], sample_size: int, 
                                   phonetized_ratio: float = 0.5) -> List[Any]:
-        """Sample data with balanced phonetized/non-phonetized dialogue ratio."""
-        
-        # Separate phonetized and non-phonetized samples
-        phonetized_samples = []
-        non_phonetized_samples = []
-        
-        for item in data:
-            if self._is_phonetized_sample(item):
-                phonetized_samples.append(item)
-            else:
-                non_phonetized_samples.append(item)
+        """Sample data with balanced phonetized/non-phonetized dialogue ratio.
+        
+        ``data`` may be any iterable, including a lazy loader stream; only
+        up to ``sample_size`` items per class are held in memory. A
+        ``ClassifiedBatch`` from ``preclassify`` is also accepted and is
+        split by its stored labels instead.
+        """
+        
+        # Separate phonetized and non-phonetized samples; neither class can
+        # contribute more than sample_size items
+        if isinstance(data, ClassifiedBatch):
+            phonetized_samples, phonetized_count, non_phonetized_samples, non_phonetized_count = (
+                data.partition(data.phonetized_mask)
+            )
+        else:
+            phonetized_samples, phonetized_count, non_phonetized_samples, non_phonetized_count = (
+                self._partition_reservoirs(data, self._is_phonetized_sample, sample_size)
+            )
         
-        self.logger.info(f"Found {len(phonetized_samples)} phonetized dialogue samples")
-        self.logger.info(f"Found {len(non_phonetized_samples)} non-phonetized dialogue samples")
+        self.logger.info(f"Found {phonetized_count} phonetized dialogue samples")
+        self.logger.info(f"Found {non_phonetized_count} non-phonetized dialogue samples")
         
         # Calculate sample sizes for each class
         phonetized_sample_size = int(sample_size * phonetized_ratio)
         non_phonetized_sample_size = sample_size - phonetized_sample_size
         
         # Adjust if we don't have enough samples
-        if len(phonetized_samples) < phonetized_sample_size:
-            phonetized_sample_size = len(phonetized_samples)
+        if phonetized_count < phonetized_sample_size:
+            phonetized_sample_size = phonetized_count
             non_phonetized_sample_size = sample_size - phonetized_sample_size
             self.logger.warning(f"Not enough phonetized samples, using {phonetized_sample_size}")
         
-        if len(non_phonetized_samples) < non_phonetized_sample_size:
-            non_phonetized_sample_size = len(non_phonetized_samples)
+        if non_phonetized_count < non_phonetized_sample_size:
+            non_phonetized_sample_size = non_phonetized_count
             phonetized_sample_size = sample_size - non_phonetized_sample_size
             self.logger.warning(f"Not enough non-phonetized samples, using {non_phonetized_sample_size}")
         
         # Sample from each class
-        sampled_phonetized = random.sample(phonetized_samples, phonetized_sample_size) if phonetized_sample_size > 0 else []
-        sampled_non_phonetized = random.sample(non_phonetized_samples, non_phonetized_sample_size) if non_phonetized_sample_size > 0 else []
-        
-        # Combine samples
-        result = sampled_phonetized + sampled_non_phonetized
+        sampled_phonetized = self._choose(phonetized_samples, phonetized_sample_size)
+        sampled_non_phonetized = self._choose(non_phonetized_samples, non_phonetized_sample_size)
         
-        # Shuffle the result
-        random.shuffle(result)
+        # Combine samples and shuffle the result
+        result = self._shuffled(sampled_phonetized + sampled_non_phonetized)
         
         self.logger.info(f"Sampled {len(sampled_phonetized)} phonetized and {len(sampled_non_phonetized)} non-phonetized dialogue samples")
         
@@ -179,64 +384,82 @@ class StratifiedSampler(SamplingStrategy):
     
     def _is_dialogue_sample(self, item: Any) -> bool:
         """Determine if a sample is dialogue or not."""
-        if isinstance(item, GBDataItem):
-            # For GB data, check if the sample contains dialogue markers
-            sample_text = item.sample.lower()
-            dialogue_markers = ['"', "'", 'said', 'asked', 'replied', 'answered', 'exclaimed']
-            return any(marker in sample_text for marker in dialogue_markers)
-        
-        elif isinstance(item, GeminiDataItem):
-            # Gemini data is already classified as dialogue
-            return True
-        
-        else:
-            # Default to non-dialogue for unknown types
-            return False
+        return self._dialogue_checks(item)
+    
+    def _is_dialogue_gb_item(self, item: GBDataItem) -> bool:
+        """Check if the GB sample contains dialogue markers."""
+        # Quotes are caseless, so they are checked on the raw text and
+        # most samples return before the lowercased copy is made.
+        sample = item.sample
+        for marker in _DIALOGUE_QUOTES:
+            if marker in sample:
+                return True
+        
+        sample_text = sample.lower()
+        for marker in _DIALOGUE_VERBS:
+            if marker in sample_text:
+                return True
+        return False
+    
+    def _is_dialogue_gemini_item(self, item: GeminiDataItem) -> bool:
+        """Gemini data is already classified as dialogue."""
+        return True
     
     def _is_phonetized_sample(self, item: Any) -> bool:
         """Determine if a sample contains phonetized text using actual patterns."""
-        if isinstance(item, GBDataItem):
-            # For GB data, check if there are phonetic words
-            return len(item.words) > 0
-        
-        elif isinstance(item, GeminiDataItem):
-            # For Gemini data, check if utterance contains any of the loaded phonetic patterns
-            utterance = item.utterance.lower()
-            # Split into words and check each word against patterns
-            words = utterance.split()
-            for word in words:
-                # Clean word of punctuation for matching
-                clean_word = ''.join(c for c in word if c.isalnum() or c in "'-")
-                if clean_word in self.phonetic_patterns:
-                    # Track pattern usage
-                    self.pattern_usage[clean_word] += 1
-                    return True
-            return False
-        
-        else:
-            # Default to non-phonetized for unknown types
+        return self._phonetized_checks(item)
+    
+    def _is_phonetized_gb_item(self, item: GBDataItem) -> bool:
+        """For GB data, check if there are phonetic words."""
+        return len(item.words) > 0
+    
+    def _is_phonetized_gemini_item(self, item: GeminiDataItem) -> bool:
+        """Check if the utterance contains any of the loaded phonetic patterns."""
+        # Clean the whole utterance of punctuation in one pass (whitespace
+        # is kept, so splitting afterwards gives the cleaned words)
+        words = _strip_non_pattern_chars(item.utterance.lower()).split()
+        phonetic_patterns = self.phonetic_patterns
+        # Most utterances match nothing; rule those out with one C-level
+        # set scan before looking for the first match
+        if phonetic_patterns.isdisjoint(words):
             return False
+        for word in words:
+            if word in phonetic_patterns:
+                # Track pattern usage
+                self.pattern_usage[word] += 1
+                return True
+        return False
     
     def save_pattern_usage_stats(self, output_file: Path, phonetized_count: int = None, non_phonetized_count: int = None) -> None:
         """Save pattern usage statistics to a text file."""
         try:
+            usage = self.pattern_usage
+            
+            # Build the whole report first and write it in one call
+            lines = [
+                "# Pattern Usage Statistics",
+                f"# Total patterns used: {len(usage)}",
+                f"# Total matches: {sum(usage.values())}",
+            ]
+            
+            # Add sample counts if provided
+            if phonetized_count is not None and non_phonetized_count is not None:
+                total_count = phonetized_count + non_phonetized_count
+                lines.append(f"# Phonetized samples: {phonetized_count}")
+                lines.append(f"# Non-phonetized samples: {non_phonetized_count}")
+                lines.append(f"# Total samples: {total_count}")
+                lines.append(f"# Phonetized ratio: {phonetized_count / total_count:.3f}")
+            
+            lines.append("")
+            
+            # Sort by usage count (descending)
+            lines.extend(f"{pattern}: {count}" for pattern, count in usage.most_common())
+            
+            # Terminate the last line
+            lines.append("")
+            
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write("# Pattern Usage Statistics\n")
-                f.write(f"# Total patterns used: {len(self.pattern_usage)}\n")
-                f.write(f"# Total matches: {sum(self.pattern_usage.values())}\n")
-                
-                # Add sample counts if provided
-                if phonetized_count is not None and non_phonetized_count is not None:
-                    f.write(f"# Phonetized samples: {phonetized_count}\n")
-                    f.write(f"# Non-phonetized samples: {non_phonetized_count}\n")
-                    f.write(f"# Total samples: {phonetized_count + non_phonetized_count}\n")
-                    f.write(f"# Phonetized ratio: {phonetized_count / (phonetized_count + non_phonetized_count):.3f}\n")
-                
-                f.write("\n")
-                
-                # Sort by usage count (descending)
-                for pattern, count in self.pattern_usage.most_common():
-                    f.write(f"{pattern}: {count}\n")
+                f.write("\n".join(lines))
             
             self.logger.info(f"Pattern usage statistics saved to {output_file}")
         except Exception as e:
@@ -251,38 +474,50 @@ class WeightedSampler(SamplingStrategy):
         super().__init__(random_seed)
         self.weights = weights
         self.logger = get_logger(self.__class__.__name__)
+        
+        # Weight functions by item type; unknown types weigh 1.0
+        self._weight_functions = TypeDispatch(
+            {GBDataItem: self._gb_weight, GeminiDataItem: self._gemini_weight},
+            default=_unit_weight,
+        )
     
     def sample(self, data: List[Any], sample_size: int) -> List[Any]:
         """Sample data using weighted selection."""
         if not data:
             return []
         
-        # Calculate weights for each item
-        item_weights = []
-        for item in data:
-            weight = self._calculate_weight(item)
-            item_weights.append(weight)
+        # Calculate weights for each item, straight into a float array
+        item_weights = np.fromiter(map(self._calculate_weight, data), dtype=np.float64, count=len(data))
         
-        # Normalize weights
-        total_weight = sum(item_weights)
+        # Cumulative weights; no normalization needed since the uniform
+        # draws are scaled by the total instead
+        cum_weights = np.cumsum(item_weights)
+        total_weight = cum_weights[-1]
         if total_weight == 0:
-            return random.sample(data, min(sample_size, len(data)))
-        
-        normalized_weights = [w / total_weight for w in item_weights]
-        
-        # Sample using weighted selection
-        return random.choices(data, weights=normalized_weights, k=min(sample_size, len(data)))
+            return self._choose(data, min(sample_size, len(data)))
+        
+        # Sample with replacement, as random.choices does: each draw picks
+        # the first item whose cumulative weight exceeds it. Searching all
+        # but the last boundary caps the index at the last item, in case
+        # rounding puts a draw at the total.
+        k = min(sample_size, len(data))
+        draws = self.rng.random(k) * total_weight
+        indices = np.searchsorted(cum_weights[:-1], draws, side="right").tolist()
+        return [data[i] for i in indices]
     
     def _calculate_weight(self, item: Any) -> float:
         """Calculate weight for an item based on its characteristics."""
-        if isinstance(item, GBDataItem):
-            # Weight based on number of phonetic words
-            phonetic_count = len([w for w in item.words.keys() if item.words[w].get("Std") != w])
-            return self.weights.get("phonetic_density", 1.0) * (phonetic_count + 1)
-        
-        elif isinstance(item, GeminiDataItem):
-            # Weight based on utterance length
-            utterance_length = len(item.utterance.split())
-            return self.weights.get("utterance_length", 1.0) * utterance_length
-        
-        return 1.0
+        return self._weight_functions(item)
+    
+    def _gb_weight(self, item: GBDataItem) -> float:
+        """Weight based on number of phonetic words."""
+        phonetic_count = 0
+        for word, word_data in item.words.items():
+            if word_data.get("Std") != word:
+                phonetic_count += 1
+        return self.weights.get("phonetic_density", 1.0) * (phonetic_count + 1)
+    
+    def _gemini_weight(self, item: GeminiDataItem) -> float:
+        """Weight based on utterance length."""
+        utterance_length = len(item.utterance.split())
+        return self.weights.get("utterance_length", 1.0) * utterance_length
@@ -0,0 +1,42 @@
+"""Dispatch on the type of an item.
+
+The loaders only ever yield a couple of concrete item classes, so handlers
+are looked up in a dict keyed by the item's exact type: one dict lookup per
+call instead of an isinstance chain. Other types (subclasses of the
+registered classes, or anything unknown) are resolved once with isinstance,
+in registration order, and cached.
+"""
+
+from typing import Any, Callable, Dict, Generic, Mapping, TypeVar
+
+T = TypeVar("T")
+
+
+class TypeDispatch(Generic[T]):
+    """Call the handler registered for an item's type, or a default."""
+    
+    __slots__ = ("_handlers", "_by_type", "_default")
+    
+    def __init__(self, handlers: Mapping[type, Callable[[Any], T]],
+                 default: Callable[[Any], T]):
+        """Register handlers by class, plus the default for any other type."""
+        self._handlers = dict(handlers)
+        self._by_type: Dict[type, Callable[[Any], T]] = dict(handlers)
+        self._default = default
+    
+    def __call__(self, item: Any) -> T:
+        """Apply the handler for ``item``'s type to it."""
+        handler = self._by_type.get(type(item))
+        if handler is None:
+            handler = self._resolve(type(item))
+        return handler(item)
+    
+    def _resolve(self, item_type: type) -> Callable[[Any], T]:
+        """Find and cache the handler for a type that is not registered."""
+        for cls, handler in self._handlers.items():
+            if issubclass(item_type, cls):
+                break
+        else:
+            handler = self._default
+        self._by_type[item_type] = handler
+        return handler
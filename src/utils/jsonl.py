@@ -0,0 +1,69 @@
+"""JSON Lines serialization helpers.
+
+Uses ``orjson`` when it is installed and falls back to the standard library
+otherwise. ``dumps`` and ``dumps_line`` always return UTF-8 encoded ``bytes``
+so callers can write straight to files opened in binary mode.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Union
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _HAS_ORJSON = False
+
+# Both parsers accept the raw bytes of a line as well as str
+loads: Callable[[Union[bytes, bytearray, str]], Any]
+
+if _HAS_ORJSON:
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize an object to compact UTF-8 JSON bytes."""
+        return orjson.dumps(obj)
+
+    def dumps_line(obj: Any) -> bytes:
+        """Serialize an object to a newline-terminated JSON Lines record."""
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+else:  # pragma: no cover - depends on the environment
+    loads = json.loads
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize an object to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def dumps_line(obj: Any) -> bytes:
+        """Serialize an object to a newline-terminated JSON Lines record."""
+        return dumps(obj) + b"\n"
+
+
+def iter_lines(file_path: Path, buffer_size: int = 1 << 20) -> Iterator[bytes]:
+    """Yield the raw lines of a file, read through a large binary buffer.
+    
+    Lines keep their trailing newline, which both JSON parsers accept. Blank
+    lines are yielded as well so callers can keep accurate line numbers.
+    """
+    with open(file_path, "rb", buffering=buffer_size) as f:
+        yield from f
+
+
+def list_jsonl_files(directory: Path) -> List[Path]:
+    """Return the .jsonl files in a directory, sorted by name.
+    
+    One scandir pass: dotfiles (.DS_Store and friends) and anything that is
+    not a regular file are left out, using the type info scandir already
+    returned instead of an extra stat per entry. Sorting keeps the order
+    the same on any filesystem.
+    """
+    with os.scandir(directory) as it:
+        paths = [
+            Path(entry.path) for entry in it
+            if entry.name.endswith(".jsonl") and not entry.name.startswith(".") and entry.is_file()
+        ]
+    paths.sort()
+    return paths
@@ -6,8 +6,6 @@ from pathlib import Path
 from typing import Optional
 
 import structlog
-from rich.console import Console
-from rich.logging import RichHandler
 
 from config import get_settings
 
@@ -42,13 +40,22 @@ def setup_logging(
     # Configure standard library logging
     level = getattr(logging, log_level.upper())
     
-    # Create console handler
-    console_handler = RichHandler(
-        console=Console(stderr=True),
-        show_time=True,
-        show_path=True,
-        markup=True,
-    )
+    # Create console handler. JSON records go to stderr as plain lines, so
+    # each record stays one parseable line and skips Rich's layout pass;
+    # Rich is only loaded for the human-readable text format.
+    console_handler: logging.Handler
+    if log_format == "json":
+        console_handler = logging.StreamHandler(sys.stderr)
+    else:
+        from rich.console import Console
+        from rich.logging import RichHandler
+        
+        console_handler = RichHandler(
+            console=Console(stderr=True),
+            show_time=True,
+            show_path=True,
+            markup=True,
+        )
     console_handler.setLevel(level)
     
     # Create formatter
@@ -0,0 +1,49 @@
+"""Shared text cleanup helpers.
+
+Everything here is built once at import time so the data processors and
+pattern classes can share it instead of compiling their own copies.
+"""
+
+import re
+from typing import Dict, Optional
+
+# Characters removed when cleaning text: anything but ASCII letters and
+# digits or whitespace
+NON_ALNUM_RE = re.compile(r"[^a-zA-Z0-9\s]")
+
+# Same set as NON_ALNUM_RE, restricted to ASCII, as a bytes.translate
+# deletion table
+_ASCII_NON_ALNUM = bytes(
+    i for i in range(128) if not (chr(i).isalnum() or chr(i).isspace())
+)
+
+
+class _NonAlnumTable(Dict[int, Optional[int]]):
+    """Lazily filled ``str.translate`` table for non-ASCII text.
+    
+    Maps code points to themselves or to ``None`` (delete) on first use, so
+    memory grows with the characters actually seen instead of holding an
+    entry for all of Unicode.
+    """
+    
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        keep = char.isspace() or (char.isascii() and char.isalnum())
+        value = codepoint if keep else None
+        self[codepoint] = value
+        return value
+
+
+_NON_ALNUM_TABLE = _NonAlnumTable()
+
+
+def strip_punctuation(text: str) -> str:
+    """Remove all characters except ASCII alphanumerics and whitespace.
+    
+    Equivalent to ``NON_ALNUM_RE.sub("", text)``. ASCII text, the common
+    case, takes a single C-level ``bytes.translate`` pass.
+    """
+    if text.isascii():
+        return text.encode("ascii").translate(None, _ASCII_NON_ALNUM).decode("ascii")
+    
+    return text.translate(_NON_ALNUM_TABLE)
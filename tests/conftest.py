@@ -0,0 +1,29 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from src.data.loaders import GBDataItem
+
+# Annotation for every word written by the gb_file fixture
+_WORD_DATA = {"Std": "x", "Prov": "CM", "OCR": 0, "i": [1], "multiword": False, "contraction": False, "dtag": "aa"}
+
+
+@pytest.fixture
+def gb_file(tmp_path):
+    """Factory writing a GB JSONL file under tmp_path, one item per word list."""
+    def write(word_lists, name="gb.jsonl"):
+        data_file = tmp_path / name
+        data_file.write_text("".join(
+            GBDataItem(
+                sample_id=index,
+                g_id="test",
+                author="Test Author",
+                title="Test Title",
+                sample=f"Test sample {index}",
+                words={word: _WORD_DATA for word in words}
+            ).model_dump_json() + "\n"
+            for index, words in enumerate(word_lists)
+        ))
+        return data_file
+    
+    return write
@@ -0,0 +1,103 @@
+"""Tests for data loading and processing."""
+
+import json
+
+import pytest
+
+from src.data.loaders import (
+    _FORMAT_KEY_RE, _PROBE_SIZE, GBDataLoader, GeminiDataLoader, create_loader,
+)
+from src.data.processors import DataProcessor
+
+_GB_RECORD = {
+    "sample_id": 1,
+    "g_id": "test",
+    "author": "Test Author",
+    "title": "Test Title",
+    "sample": "I'm goin' home",
+    "words": {"goin'": {"Std": "going"}},
+}
+
+
+def _merge_by_equality(annotations):
+    """Reference merge: keep each annotation not equal to an earlier one."""
+    merged = []
+    for annotation in annotations:
+        if annotation not in merged:
+            merged.append(annotation)
+    return merged
+
+
+class _Loose:
+    """Value that is not plain data but compares equal to 1."""
+    
+    __hash__ = None
+    
+    def __eq__(self, other):
+        return other == 1
+
+
+class TestDataProcessor:
+    """Test cases for DataProcessor."""
+    
+    @pytest.mark.parametrize("annotations", [
+        [{"start": 1}, {"start": 1.0}],
+        [{"flag": True}, {"flag": 1}],
+        [{"spans": [1, 2]}, {"spans": (1, 2)}],
+        [{1: "a"}, {"1": "a"}],
+        [{"a": 1, "b": 2}, {"b": 2, "a": 1}],
+        [{"spans": [{"label": "PHONETIC"}]}, {"spans": [{"label": "PHONETIC"}]}, {"spans": []}],
+        [{"value": _Loose()}, {"value": 1}, {"value": 2}],
+        [{"value": {1, 2}}, {"value": {2, 1}}],
+    ])
+    def test_merge_annotations_matches_equality(self, annotations):
+        """Test that merging keeps exactly the annotations == would keep."""
+        merged = DataProcessor().merge_annotations(annotations)
+        
+        expected = _merge_by_equality(annotations)
+        assert len(merged) == len(expected)
+        assert all(kept is reference for kept, reference in zip(merged, expected))
+    
+    def test_merge_annotations_handles_circular_data(self):
+        """Test that circular annotations fall back to equality instead of raising."""
+        circular = {"text": "x"}
+        circular["self"] = circular
+        
+        merged = DataProcessor().merge_annotations([circular, {"text": "y"}, circular])
+        
+        assert merged == [circular, {"text": "y"}]
+
+
+class TestCreateLoader:
+    """Test cases for create_loader."""
+    
+    @pytest.mark.parametrize("record, loader_class", [
+        (_GB_RECORD, GBDataLoader),
+        ({"utterance": "I'm goin' home", "speaker": "Jim"}, GeminiDataLoader),
+        # Key names quoted inside a string are escaped, not keys
+        ({"utterance": "I'm goin' home", 'He wrote "words': 1}, GeminiDataLoader),
+        ({'He wrote "sample_id': 1, 'and "words': 2, "utterance": "home"}, GeminiDataLoader),
+        # Identifying keys beyond the probe are found by the parse fallback
+        ({"speaker": "x" * _PROBE_SIZE, "utterance": "I'm goin' home"}, GeminiDataLoader),
+        ({**_GB_RECORD, "sample": "x" * _PROBE_SIZE}, GBDataLoader),
+        ({"sample_id": 1, "words": {"utterance": {"Std": "utterance"}}}, GBDataLoader),
+    ])
+    def test_picks_loader_from_first_record(self, tmp_path, record, loader_class):
+        """Test that the first record's keys decide the loader."""
+        data_file = tmp_path / "data.jsonl"
+        data_file.write_text(json.dumps(record) + "\n" + json.dumps(record) + "\n")
+        
+        assert type(create_loader(data_file)) is loader_class
+    
+    def test_key_pattern_skips_escaped_keys(self):
+        """Test that key names inside string values are not taken for keys."""
+        line = json.dumps({'He wrote "sample_id': 1, 'and "words': 2, "utterance": "home"}).encode()
+        
+        assert _FORMAT_KEY_RE.findall(line) == [b"utterance"]
+    
+    def test_defaults_to_gb_loader(self, tmp_path):
+        """Test that an unreadable first record falls back to the GB loader."""
+        data_file = tmp_path / "data.jsonl"
+        data_file.write_text("not json\n")
+        
+        assert type(create_loader(data_file)) is GBDataLoader
@@ -5,7 +5,9 @@ from pathlib import Path
 from unittest.mock import Mock, patch
 
 from src.patterns import PatternGenerator
+from src.patterns.generator import Pattern
 from src.data.loaders import GBDataItem
+from src.utils.jsonl import dumps_line
 
 
 class TestPatternGenerator:
@@ -54,6 +56,44 @@ class TestPatternGenerator:
         assert all(pattern.label == "PHONETIC" for pattern in patterns)
         assert all(len(pattern.pattern) == 1 for pattern in patterns)
     
+    def test_extract_patterns_punctuation_variants(self):
+        """Test that words with punctuation yield original and cleaned variants."""
+        generator = PatternGenerator()
+        
+        item = GBDataItem(
+            sample_id=1,
+            g_id="test",
+            author="Test Author",
+            title="Test Title",
+            sample="Test sample",
+            words={
+                "'Neath": {"Std": "beneath", "Prov": "CM", "OCR": 0, "i": [1], "multiword": False, "contraction": False, "dtag": "aa"},
+                "heben": {"Std": "heaven", "Prov": "CM", "OCR": 0, "i": [2], "multiword": False, "contraction": False, "dtag": "aa"}
+            }
+        )
+        
+        patterns = generator._extract_patterns_from_gb_item(item)
+        
+        # Original variant first, cleaned variant second, no duplicate for clean words
+        assert [pattern.pattern[0]["lower"] for pattern in patterns] == ["'neath", "neath", "heben"]
+    
+    def test_extract_patterns_skips_repeated_words(self):
+        """Test that a word seen in an earlier item yields no new patterns."""
+        generator = PatternGenerator()
+        
+        item = GBDataItem(
+            sample_id=1,
+            g_id="test",
+            author="Test Author",
+            title="Test Title",
+            sample="Test sample",
+            words={"'Neath": {"Std": "beneath", "Prov": "CM", "OCR": 0, "i": [1], "multiword": False, "contraction": False, "dtag": "aa"}}
+        )
+        
+        assert len(generator._extract_patterns_from_gb_item(item)) == 2
+        assert generator._extract_patterns_from_gb_item(item) == []
+        assert "'neath" in generator.seen_words
+    
     @patch('src.patterns.generator.create_loader')
     def test_generate_from_gb_data(self, mock_create_loader):
         """Test pattern generation from GB data file."""
@@ -78,3 +118,46 @@ class TestPatternGenerator:
         assert len(patterns) == 1
         assert patterns[0].label == "PHONETIC"
         assert patterns[0].pattern[0]["lower"] == "test"
+    
+    def test_generate_from_gb_files_merges_across_files(self, gb_file):
+        """Test that parallel generation drops patterns repeated across files."""
+        files = [
+            gb_file([words], name=f"gb_{index}.jsonl")
+            for index, words in enumerate([["heben", "gwine"], ["gwine", "dey'll"]])
+        ]
+        
+        generator = PatternGenerator()
+        patterns = list(generator.generate_from_gb_files(files, max_workers=2))
+        
+        assert [pattern.pattern[0]["lower"] for pattern in patterns] == ["heben", "gwine", "dey'll", "deyll"]
+    
+    def test_generate_from_gb_files_matches_serial(self, gb_file):
+        """Test that parallel generation dedupes on the same key as serial."""
+        files = [
+            gb_file([words], name=f"gb_{index}.jsonl")
+            for index, words in enumerate([["gwine  home", "heben"], ["gwine home", "heben"]])
+        ]
+        
+        serial = list(PatternGenerator().generate_from_gb_files(files, max_workers=1))
+        parallel = list(PatternGenerator().generate_from_gb_files(files, max_workers=2))
+        
+        assert [pattern.pattern for pattern in parallel] == [pattern.pattern for pattern in serial]
+        assert len(serial) == 3
+    
+    def test_save_patterns_matches_dumps_line(self, tmp_path):
+        """Test that the single-token byte template writes what dumps_line would."""
+        words = [
+            "gwine", 'say "hi"', "back\\slash", "tab\tnew\nline\x00\x1f\x7f",
+            "café", "東京", "🙂 emoji", "line\u2028separator",
+        ]
+        patterns = [Pattern(label="PHONETIC", pattern=[{"lower": word}]) for word in words]
+        patterns.append(Pattern(label="PHONETIC", pattern=[{"lower": "gwine"}, {"lower": "home"}]))
+        patterns.append(Pattern(label="DIALECT", pattern=[{"lower": 'y"all'}]))
+        output_file = tmp_path / "patterns.jsonl"
+        
+        assert PatternGenerator().save_patterns(patterns, output_file) == len(patterns)
+        
+        expected = b"".join(
+            dumps_line({"label": pattern.label, "pattern": pattern.pattern}) for pattern in patterns
+        )
+        assert output_file.read_bytes() == expected
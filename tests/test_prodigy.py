@@ -0,0 +1,151 @@
+"""Tests for Prodigy formatting and the conversion script."""
+
+import errno
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+import run_prodigy
+from scripts import format_for_prodigy
+from src.data.loaders import GeminiDataItem
+from src.prodigy.formatter import ProdigyFormatter
+from src.prodigy.runner import ProdigyRunner
+
+
+def _write_gemini_file(path, utterances):
+    """Write one Gemini record per utterance to a JSONL file."""
+    path.write_text("".join(
+        GeminiDataItem(utterance=utterance, speaker="Jim").model_dump_json() + "\n"
+        for utterance in utterances
+    ))
+
+
+class TestProdigyFormatter:
+    """Test cases for ProdigyFormatter."""
+    
+    def test_format_gemini_file_reads_input_before_replacing_it(self, tmp_path):
+        """Test that converting a file onto itself keeps every record."""
+        data_file = tmp_path / "a.jsonl"
+        _write_gemini_file(data_file, ["I'm goin' home", "Hello there"])
+        
+        assert ProdigyFormatter().format_gemini_file(data_file, data_file) == 2
+        
+        rows = [json.loads(line) for line in data_file.read_text().splitlines()]
+        assert [row["text"] for row in rows] == ["I'm goin' home", "Hello there"]
+        assert [path.name for path in tmp_path.iterdir()] == ["a.jsonl"]
+    
+    def test_add_annotation_metadata(self):
+        """Test that annotation fields fill an existing meta dict or a new one."""
+        formatter = ProdigyFormatter()
+        with_meta = {"text": "I'm goin' home", "meta": {"source": "gemini_data"}}
+        without_meta = {"text": "Hello there"}
+        
+        formatter.add_annotation_metadata(with_meta, created_at="2024-01-01T00:00:00")
+        formatter.add_annotation_metadata(without_meta, annotation_type="dialect")
+        
+        assert with_meta["meta"] == {
+            "source": "gemini_data",
+            "annotation_type": "phonetic",
+            "annotation_status": "pending",
+            "created_at": "2024-01-01T00:00:00",
+        }
+        assert without_meta["meta"]["annotation_type"] == "dialect"
+        assert without_meta["meta"]["annotation_status"] == "pending"
+        assert without_meta["meta"]["created_at"]
+
+
+class TestProdigyRunner:
+    """Test cases for ProdigyRunner."""
+    
+    @pytest.mark.parametrize("stdout, total, annotated", [
+        ("Total: 10\nAnnotated: 4\n", 10, 4),
+        # "total" takes precedence over "annotated" on the same line
+        ("Total annotated: 7\n", 7, 0),
+        ("Annotated in total 7\n", 7, 0),
+        # Later lines win
+        ("Total: 1\nTotal: 2\n", 2, 0),
+        ("Total: 1_000\nAnnotated: +5\n", 1000, 5),
+        ("Total: -3\n", -3, 0),
+        ("Total: 1__0\nAnnotated: 5_\n", 0, 0),
+        # The number must be the last whitespace-separated token
+        ("Total: 12 examples\nAnnotated: 3\n", 0, 3),
+        ("total:5\nannotated:4\n", 0, 0),
+        ("Total: 10\r\nAnnotated: 4\r\n", 10, 4),
+        ("Dataset: phonetics\nCreated: 2024\n", 0, 0),
+        ("", 0, 0),
+    ])
+    def test_get_annotation_stats_parses_db_stats(self, stdout, total, annotated):
+        """Test that db-stats lines are parsed like splitting off their last token."""
+        with patch("src.prodigy.runner.subprocess.run") as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout=stdout)
+            stats = ProdigyRunner().get_annotation_stats("phonetics")
+        
+        assert stats == {
+            "total_examples": total,
+            "annotated_examples": annotated,
+            "pending_examples": total - annotated,
+        }
+
+
+class TestFormatForProdigy:
+    """Test cases for the format_for_prodigy script."""
+    
+    def test_converts_directory(self, tmp_path, monkeypatch):
+        """Test that every input file is converted to a Prodigy file of the same name."""
+        input_dir = tmp_path / "gemini"
+        input_dir.mkdir()
+        _write_gemini_file(input_dir / "a.jsonl", ["I'm goin' home", "Hello there"])
+        _write_gemini_file(input_dir / "b.jsonl", ["Dey's comin'"])
+        (input_dir / ".DS_Store").write_text("")
+        output_dir = tmp_path / "prodigy"
+        
+        monkeypatch.setattr("sys.argv", [
+            "format_for_prodigy.py", str(input_dir), "-o", str(output_dir), "--max-workers", "2",
+        ])
+        assert format_for_prodigy.main() == 0
+        
+        assert sorted(path.name for path in output_dir.iterdir()) == ["a.jsonl", "b.jsonl"]
+        rows = [json.loads(line) for line in (output_dir / "a.jsonl").read_text().splitlines()]
+        assert [row["text"] for row in rows] == ["I'm goin' home", "Hello there"]
+        assert rows[0]["meta"]["source_file"] == "a.jsonl"
+        assert rows[0]["meta"]["speaker"] == "Jim"
+        assert "is_phonetized" not in rows[0]["meta"]
+    
+    def test_rejects_output_in_input_dir(self, tmp_path, monkeypatch):
+        """Test that converting a directory onto itself leaves the inputs alone."""
+        input_dir = tmp_path / "gemini"
+        input_dir.mkdir()
+        _write_gemini_file(input_dir / "a.jsonl", ["I'm goin' home"])
+        original = (input_dir / "a.jsonl").read_bytes()
+        
+        monkeypatch.setattr("sys.argv", [
+            "format_for_prodigy.py", str(input_dir), "-o", str(tmp_path / "gemini" / "."),
+        ])
+        assert format_for_prodigy.main() == 1
+        
+        assert (input_dir / "a.jsonl").read_bytes() == original
+
+
+class TestRunProdigy:
+    """Test cases for the run_prodigy launcher."""
+    
+    @pytest.mark.parametrize("error, exit_code", [
+        (FileNotFoundError(errno.ENOENT, "No such file or directory"), 127),
+        (PermissionError(errno.EACCES, "Permission denied"), 126),
+        (OSError(errno.ENOEXEC, "Exec format error"), 126),
+    ])
+    def test_exec_failure_exits_with_shell_status(self, error, exit_code, capsys):
+        """Test that a failed exec exits with 127 (not found) or 126 (not runnable)."""
+        config = {
+            "port": 8080, "command": "spans.manual", "dataset": "phonetics", "model": "blank:en",
+            "data_file": "data.jsonl", "loader": "jsonl", "labels": "PHONETIC",
+            "patterns_file": "patterns.jsonl",
+        }
+        
+        with patch("run_prodigy.os.execvpe", side_effect=error):
+            with pytest.raises(SystemExit) as exc_info:
+                run_prodigy.run_prodigy(config)
+        
+        assert exc_info.value.code == exit_code
+        assert "Error:" in capsys.readouterr().out
@@ -0,0 +1,170 @@
+"""Tests for sampling strategies."""
+
+from collections import Counter
+
+from src.data.loaders import GeminiDataItem
+from src.sampling import DataBalancer, StratifiedSampler
+from src.sampling.strategies import WeightedSampler
+
+
+class TestStratifiedSampler:
+    """Test cases for StratifiedSampler."""
+    
+    def test_partition_reservoirs_keeps_small_classes_whole(self):
+        """Test that classes within capacity are kept whole and in order."""
+        sampler = StratifiedSampler(random_seed=42)
+        
+        evens, even_count, odds, odd_count = sampler._partition_reservoirs(
+            iter(range(10)), lambda n: n % 2 == 0, capacity=5
+        )
+        
+        assert evens == [0, 2, 4, 6, 8]
+        assert odds == [1, 3, 5, 7, 9]
+        assert (even_count, odd_count) == (5, 5)
+    
+    def test_partition_reservoirs_caps_large_classes(self):
+        """Test that reservoirs never exceed capacity but counts cover the stream."""
+        sampler = StratifiedSampler(random_seed=42)
+        
+        evens, even_count, odds, odd_count = sampler._partition_reservoirs(
+            iter(range(1000)), lambda n: n % 2 == 0, capacity=10
+        )
+        
+        assert len(evens) == 10 and len(odds) == 10
+        assert all(n % 2 == 0 for n in evens)
+        assert all(n % 2 == 1 for n in odds)
+        assert len(set(evens)) == 10 and len(set(odds)) == 10
+        assert (even_count, odd_count) == (500, 500)
+    
+    def test_partition_reservoirs_include_items_uniformly(self):
+        """Test that every stream position is equally likely to be kept."""
+        sampler = StratifiedSampler(random_seed=5)
+        kept = Counter()
+        
+        for _ in range(4000):
+            reservoir, _, _, _ = sampler._partition_reservoirs(
+                iter(range(40)), lambda n: True, capacity=5
+            )
+            kept.update(reservoir)
+        
+        # Each of the 40 items is kept with probability 5/40: 500 times
+        assert sorted(kept) == list(range(40))
+        assert all(400 < count < 600 for count in kept.values())
+    
+    def test_sample_accepts_stream(self):
+        """Test that sampling works from a one-shot iterator."""
+        sampler = StratifiedSampler(random_seed=42)
+        
+        result = sampler.sample(iter(range(100)), sample_size=10, dialogue_ratio=0.0)
+        
+        assert len(result) == 10
+        assert len(set(result)) == 10
+    
+    def test_is_phonetized_sample_cleans_punctuation(self):
+        """Test that words match patterns once punctuation is stripped."""
+        sampler = StratifiedSampler(random_seed=42)
+        sampler.phonetic_patterns = {"goin'", "y'all"}
+        
+        assert sampler._is_phonetized_sample(GeminiDataItem(utterance='"Goin\'," she said.'))
+        assert sampler._is_phonetized_sample(GeminiDataItem(utterance="Well, Y'ALL!"))
+        assert not sampler._is_phonetized_sample(GeminiDataItem(utterance="going home"))
+        assert sampler.pattern_usage == {"goin'": 1, "y'all": 1}
+    
+    def test_seeded_samplers_are_independent(self):
+        """Test that samplers with the same seed draw the same sample."""
+        first = StratifiedSampler(random_seed=7)
+        second = StratifiedSampler(random_seed=7)
+        
+        expected = first.sample(iter(range(1000)), sample_size=20, dialogue_ratio=0.0)
+        # Drawing from another sampler in between must not change the result
+        StratifiedSampler(random_seed=1).sample(iter(range(1000)), sample_size=20, dialogue_ratio=0.0)
+        
+        assert second.sample(iter(range(1000)), sample_size=20, dialogue_ratio=0.0) == expected
+    
+    def test_sample_from_preclassified_batch(self):
+        """Test that a preclassified batch is split by its stored labels."""
+        sampler = StratifiedSampler(random_seed=42)
+        sampler.phonetic_patterns = frozenset({"goin'"})
+        utterances = ["I'm goin' home"] * 5 + ["going home"] * 15
+        batch = sampler.preclassify(GeminiDataItem(utterance=u) for u in utterances)
+        
+        assert len(batch) == 20
+        assert int(batch.phonetized_mask.sum()) == 5
+        assert sampler.pattern_usage == {"goin'": 5}
+        
+        result = sampler.sample_phonetized_dialogue(batch, sample_size=10, phonetized_ratio=0.5)
+        
+        assert sorted(item.utterance for item in result) == ["I'm goin' home"] * 5 + ["going home"] * 5
+        # Labels were reused, not recomputed
+        assert sampler.pattern_usage == {"goin'": 5}
+        assert len(sampler.sample(batch, sample_size=4, dialogue_ratio=1.0)) == 4
+
+
+class TestWeightedSampler:
+    """Test cases for WeightedSampler."""
+    
+    def test_sample_follows_weights(self):
+        """Test seeded draws: size, reproducibility and weight proportions."""
+        # Utterance weight is its word count: 1, 3, or 0 for the empty one
+        data = [GeminiDataItem(utterance=text) for text in ["one", "one two three", ""] * 1000]
+        
+        first = WeightedSampler({"utterance_length": 1.0}, random_seed=11).sample(data, 2000)
+        second = WeightedSampler({"utterance_length": 1.0}, random_seed=11).sample(data, 2000)
+        
+        assert len(first) == 2000
+        assert first == second
+        assert all(item.utterance for item in first)
+        three_word_share = sum(item.utterance == "one two three" for item in first) / len(first)
+        assert 0.70 < three_word_share < 0.80
+    
+    def test_sample_size_capped_at_population(self):
+        """Test that asking for more than the population draws once per item."""
+        data = [GeminiDataItem(utterance="one two") for _ in range(5)]
+        
+        result = WeightedSampler({}, random_seed=3).sample(data, 50)
+        
+        assert len(result) == 5
+        assert all(item in data for item in result)
+    
+    def test_sample_without_weight_picks_distinct_items(self):
+        """Test that an all-zero weight total falls back to a uniform pick."""
+        data = [GeminiDataItem(utterance="") for _ in range(10)]
+        
+        result = WeightedSampler({}, random_seed=3).sample(data, 4)
+        
+        assert len(result) == 4
+        assert len({id(item) for item in result}) == 4
+
+
+class TestDataBalancer:
+    """Test cases for DataBalancer."""
+    
+    def test_balance_mixed_stream_matches_mixed_data(self, tmp_path, gb_file):
+        """Test that streamed mixed rows match, classifying kept items once."""
+        gb_path = gb_file([["goin'"] if index % 3 else [] for index in range(30)])
+        gemini_file = tmp_path / "gemini.jsonl"
+        gemini_file.write_text("".join(
+            GeminiDataItem(utterance=f"I'm goin' home {index}" if index % 2 else f"Line {index}").model_dump_json() + "\n"
+            for index in range(30)
+        ))
+        
+        expected_balancer = DataBalancer(random_seed=7)
+        expected_balancer.sampler.phonetic_patterns = frozenset({"goin'"})
+        gb, gemini = expected_balancer.balance_mixed_data(gb_path, [gemini_file], sample_size=10)
+        expected_stats = expected_balancer.get_balance_statistics(gb + gemini)
+        expected_rows = [expected_balancer._convert_to_prodigy_format(x) for x in gb + gemini]
+        
+        balancer = DataBalancer(random_seed=7)
+        balancer.sampler.phonetic_patterns = frozenset({"goin'"})
+        rows, stats = balancer.balance_mixed_stream(gb_path, [gemini_file], sample_size=10)
+        
+        usage_before_rows = sum(balancer.sampler.pattern_usage.values())
+        rows = list(rows)
+        
+        assert rows == expected_rows
+        assert stats == expected_stats
+        assert stats["total"] == 10
+        # Each kept Gemini item is classified once, and not again when its
+        # row is formatted
+        phonetized_gemini = sum(row["meta"].get("is_phonetized", False) for row in rows)
+        assert usage_before_rows == sum(balancer.sampler.pattern_usage.values()) == phonetized_gemini
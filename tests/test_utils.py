@@ -0,0 +1,54 @@
+"""Tests for utility modules."""
+
+import pytest
+
+from src.utils.dispatch import TypeDispatch
+from src.utils.jsonl import list_jsonl_files
+from src.utils.text import NON_ALNUM_RE, strip_punctuation
+
+
+class TestTypeDispatch:
+    """Test cases for TypeDispatch."""
+    
+    def test_dispatches_on_type_with_subclass_and_default(self):
+        """Test exact types, subclasses (in registration order) and the default."""
+        dispatch = TypeDispatch({bool: lambda item: "bool", int: lambda item: "int"},
+                                default=lambda item: "other")
+        
+        class Count(int):
+            pass
+        
+        assert dispatch(True) == "bool"
+        assert dispatch(3) == "int"
+        assert dispatch(Count(3)) == "int"
+        assert dispatch("3") == "other"
+        assert dispatch("4") == "other"
+
+
+class TestStripPunctuation:
+    """Test cases for strip_punctuation."""
+    
+    @pytest.mark.parametrize("text", [
+        "I'm goin' home, ain't I?",
+        "Café déjà vu: naïve façade!",
+        "東京へ行きます。「はい」",
+        "ｆｕｌｌｗｉｄｔｈ １２３ and ①②",
+        "non\u00a0breaking\u2003em\u3000ideographic\x1cseparators",
+        "mixed: straße, Ελληνικά, русский — “quoted” …",
+        "".join(map(chr, range(0x2100))),
+    ])
+    def test_matches_regex(self, text):
+        """Test that ASCII and non-ASCII text are cleaned exactly like the regex."""
+        assert strip_punctuation(text) == NON_ALNUM_RE.sub("", text)
+
+
+class TestListJsonlFiles:
+    """Test cases for list_jsonl_files."""
+    
+    def test_lists_regular_jsonl_files_sorted(self, tmp_path):
+        """Test that dotfiles, other suffixes and directories are left out."""
+        for name in ["b.jsonl", "a.jsonl", ".hidden.jsonl", "notes.txt"]:
+            (tmp_path / name).write_text("")
+        (tmp_path / "dir.jsonl").mkdir()
+        
+        assert list_jsonl_files(tmp_path) == [tmp_path / "a.jsonl", tmp_path / "b.jsonl"]